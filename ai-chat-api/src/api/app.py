@@ -1,24 +1,32 @@
 from fastapi import FastAPI, Depends, HTTPException, File, UploadFile, Form
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.orm.attributes import flag_modified
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
+from contextlib import aclosing
+import asyncio
 import uuid
 import logging
 import base64
 import os
-import json
+import orjson
 
 from src.config.settings import CORS_ORIGINS, AI_RESPONSE_LANGUAGE, DATABASE_URL
-from src.database.database import get_db, init_db
+from src.database.database import get_db, init_db, warm_pool, SessionLocal
 from src.database import models as db_models
 from src.api import models as api_models
-from src.api.chat_service import get_ai_response, get_ai_response_with_image, build_message_history
-from src.api.psychology_report_routes import router as psychology_report_router
+from src.api.chat_service import (
+    get_ai_response, get_ai_response_stream, get_ai_response_with_image,
+    build_message_history, close_ai_client, AIRateLimitError, AITimeoutError
+)
+from src.api.psychology_report_routes import (
+    router as psychology_report_router, start_report_worker, stop_report_worker
+)
 
 # Configure logging
 logging.basicConfig(
@@ -27,7 +35,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="AI Chat API with Module Recommendations", version="2.0.0")
+# Sketch uploads are written here (served back as /uploads/sketches/<name>);
+# created once at import instead of on every upload
+SKETCH_UPLOAD_DIR = Path("uploads/sketches")
+SKETCH_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+
+app = FastAPI(
+    title="AI Chat API with Module Recommendations",
+    version="2.0.0",
+    default_response_class=ORJSONResponse
+)
 
 # CORS middleware
 app.add_middleware(
@@ -51,6 +68,18 @@ async def startup_event():
     except Exception as e:
         logger.error(f"✗ Failed to initialize database: {e}")
         raise
+    try:
+        warm_pool()
+    except Exception as e:
+        logger.warning(f"Could not pre-warm database pool: {e}")
+    start_report_worker()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the report worker and release the shared OpenAI HTTP pool"""
+    await stop_report_worker()
+    await close_ai_client()
 
 
 @app.get("/")
@@ -68,6 +97,19 @@ def root():
     }
 
 
+def _conversation_response(conversation: db_models.Conversation) -> ORJSONResponse:
+    """
+    Serialize a conversation for the API
+
+    Rows come straight from the database, so the response model is built with
+    model_construct (no re-validation). response_model on the routes still
+    documents the shape.
+    """
+    return ORJSONResponse(
+        content=api_models.ConversationResponse.from_orm_fast(conversation).model_dump(mode="json")
+    )
+
+
 @app.post("/conversations/", response_model=api_models.ConversationResponse)
 def create_conversation(
     conversation: api_models.ConversationCreate,
@@ -91,55 +133,56 @@ def create_conversation(
     db.add(db_conversation)
     db.commit()
     db.refresh(db_conversation)
-    return db_conversation
+    return _conversation_response(db_conversation)
 
 
 @app.get("/conversations/session/{session_id}", response_model=api_models.ConversationResponse)
 def get_conversation_by_session(session_id: str, db: Session = Depends(get_db)):
     """Get conversation by session ID"""
-    conversation = db.query(db_models.Conversation).filter(
+    conversation = db.query(db_models.Conversation).options(
+        selectinload(db_models.Conversation.messages)
+    ).filter(
         db_models.Conversation.session_id == session_id
     ).first()
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
-    return conversation
+    return _conversation_response(conversation)
 
 
 @app.get("/conversations/{conversation_id}", response_model=api_models.ConversationResponse)
 def get_conversation(conversation_id: int, db: Session = Depends(get_db)):
     """Get conversation by ID"""
-    conversation = db.query(db_models.Conversation).filter(
+    conversation = db.query(db_models.Conversation).options(
+        selectinload(db_models.Conversation.messages)
+    ).filter(
         db_models.Conversation.id == conversation_id
     ).first()
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
-    return conversation
+    return _conversation_response(conversation)
 
 
 @app.get("/conversations/user/{user_id}", response_model=List[api_models.ConversationResponse])
 def get_user_conversations(user_id: str, db: Session = Depends(get_db)):
     """Get all conversations for a user"""
-    conversations = db.query(db_models.Conversation).filter(
+    # Load every conversation's messages in one extra query instead of one per conversation
+    conversations = db.query(db_models.Conversation).options(
+        selectinload(db_models.Conversation.messages)
+    ).filter(
         db_models.Conversation.user_id == user_id
     ).all()
-    return conversations
+    return ORJSONResponse(content=[
+        api_models.ConversationResponse.from_orm_fast(c).model_dump(mode="json")
+        for c in conversations
+    ])
 
 
-@app.post("/chat/", response_model=api_models.ChatResponse)
-def chat(
+def _get_or_create_chat_conversation(
     chat_request: api_models.ChatRequest,
-    user_id: str = None,
-    db: Session = Depends(get_db)
-):
-    """
-    Send a message and get AI response with natural module recommendations
-
-    The AI uses function calling to detect when it recommends modules.
-    Module recommendations are tracked in conversation metadata.
-    """
-    logger.info(f"Received chat request: {chat_request.message[:100]}...")
-
-    # Get or create conversation
+    user_id: Optional[str],
+    db: Session
+) -> db_models.Conversation:
+    """Load the conversation for a chat request, creating it if needed"""
     if chat_request.session_id:
         conversation = db.query(db_models.Conversation).filter(
             db_models.Conversation.session_id == chat_request.session_id
@@ -175,29 +218,151 @@ def chat(
         flag_modified(conversation, "extra_data")
         db.commit()
 
-    # Save user message
+    return conversation
+
+
+def _save_user_message_and_history(
+    conversation: db_models.Conversation,
+    content: str,
+    db: Session
+) -> tuple:
+    """Save the user's message and return it with the message history for the AI"""
     user_message = db_models.Message(
         conversation_id=conversation.id,
         role="user",
-        content=chat_request.message
+        content=content
     )
     db.add(user_message)
     db.commit()
     db.refresh(user_message)
 
-    # Get conversation history
-    messages = db.query(db_models.Message).filter(
+    # Get conversation history (only the columns the prompt needs)
+    messages = db.query(db_models.Message).with_entities(
+        db_models.Message.role, db_models.Message.content
+    ).filter(
         db_models.Message.conversation_id == conversation.id
     ).order_by(db_models.Message.created_at).all()
 
     # Build message history for AI
     message_history = build_message_history(messages)
     logger.info(f"Built message history with {len(message_history)} messages")
+    return user_message, message_history
+
+
+def _mark_modules_recommended(
+    conversation: db_models.Conversation,
+    recommended_modules: List[Dict],
+    db: Session
+):
+    """Update conversation metadata with new recommendations"""
+    if not recommended_modules:
+        return
+
+    module_status = conversation.extra_data.get("module_status", {})
+    recommended_at = datetime.now(timezone.utc).isoformat()
+
+    for module in recommended_modules:
+        module_id = module["module_id"]
+        # Only mark as recommended if not already completed
+        if module_id not in module_status or not module_status[module_id].get("completed_at"):
+            if module_id not in module_status:
+                module_status[module_id] = {}
+            if not module_status[module_id].get("recommended_at"):
+                module_status[module_id]["recommended_at"] = recommended_at
+                logger.info(f"Marked module {module_id} as recommended")
+
+    conversation.extra_data["module_status"] = module_status
+    flag_modified(conversation, "extra_data")
+    db.commit()
+    db.refresh(conversation)
+
+
+def _save_assistant_message(
+    conversation: db_models.Conversation,
+    ai_response_data: Dict,
+    db: Session
+) -> db_models.Message:
+    """Save assistant message with recommendation metadata"""
+    assistant_message = db_models.Message(
+        conversation_id=conversation.id,
+        role="assistant",
+        content=ai_response_data["content"],
+        extra_data={
+            "recommended_modules": ai_response_data.get("recommended_modules", []),
+            "function_calls": ai_response_data.get("function_calls", [])
+        }
+    )
+    db.add(assistant_message)
+    db.commit()
+    db.refresh(assistant_message)
+    return assistant_message
+
+
+def _start_chat_turn(
+    chat_request: api_models.ChatRequest,
+    user_id: Optional[str],
+    db: Session
+) -> tuple:
+    """Load or create the conversation and save the user's message (blocking)"""
+    conversation = _get_or_create_chat_conversation(chat_request, user_id, db)
+    user_message, message_history = _save_user_message_and_history(
+        conversation, chat_request.message, db
+    )
+    return conversation, user_message, message_history
+
+
+def _finish_chat_turn(
+    conversation: db_models.Conversation,
+    user_message: db_models.Message,
+    ai_response_data: Dict,
+    db: Session
+) -> Dict:
+    """
+    Save the assistant message and build the chat response body (blocking)
+
+    The commit expires loaded rows, so the response is built here as well
+    rather than reloading them from the event loop.
+    """
+    assistant_message = _save_assistant_message(conversation, ai_response_data, db)
+
+    # Rows are trusted, so build the response without re-validating it
+    response = api_models.ChatResponse.model_construct(
+        session_id=conversation.session_id,
+        conversation_id=conversation.id,
+        user_message=api_models.MessageResponse.from_orm_fast(user_message),
+        assistant_message=api_models.MessageResponse.from_orm_fast(assistant_message),
+        recommended_modules=[  # Include at top level
+            api_models.ModuleRecommendation.model_construct(**module)
+            for module in ai_response_data.get("recommended_modules", [])
+        ],
+        module_status=conversation.extra_data.get("module_status", {})  # Include current status
+    )
+    return response.model_dump(mode="json")
+
+
+@app.post("/chat/", response_model=api_models.ChatResponse)
+async def chat(
+    chat_request: api_models.ChatRequest,
+    user_id: str = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Send a message and get AI response with natural module recommendations
+
+    The AI uses function calling to detect when it recommends modules.
+    Module recommendations are tracked in conversation metadata.
+    """
+    logger.info(f"Received chat request: {chat_request.message[:100]}...")
+
+    # Database work runs in worker threads so it doesn't stall the event loop
+    conversation, user_message, message_history = await asyncio.to_thread(
+        _start_chat_turn, chat_request, user_id, db
+    )
 
     # Get AI response with module recommendations
     # Language is auto-detected from the user's message
     try:
-        ai_response_data = get_ai_response(
+        ai_response_data = await get_ai_response(
             messages=message_history,
             conversation_id=conversation.id,
             db_session=db,
@@ -210,53 +375,92 @@ def chat(
         logger.info(f"AI response: {ai_content[:100]}...")
         logger.info(f"Module recommendations: {len(recommended_modules)} modules")
 
-        # Update conversation metadata with new recommendations
-        if recommended_modules:
-            module_status = conversation.extra_data.get("module_status", {})
-
-            for module in recommended_modules:
-                module_id = module["module_id"]
-                # Only mark as recommended if not already completed
-                if module_id not in module_status or not module_status[module_id].get("completed_at"):
-                    if module_id not in module_status:
-                        module_status[module_id] = {}
-                    if not module_status[module_id].get("recommended_at"):
-                        module_status[module_id]["recommended_at"] = datetime.utcnow().isoformat()
-                        logger.info(f"Marked module {module_id} as recommended")
-
-            conversation.extra_data["module_status"] = module_status
-            flag_modified(conversation, "extra_data")
-            db.commit()
-            db.refresh(conversation)
+        await asyncio.to_thread(_mark_modules_recommended, conversation, recommended_modules, db)
 
+    except AIRateLimitError as e:
+        logger.warning(f"AI provider rate limited the request: {e}")
+        raise HTTPException(status_code=429, detail=str(e))
+    except AITimeoutError as e:
+        logger.error(f"AI provider timed out: {e}")
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         logger.error(f"Error getting AI response: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-    # Save assistant message with metadata
-    assistant_message = db_models.Message(
-        conversation_id=conversation.id,
-        role="assistant",
-        content=ai_content,
-        extra_data={
-            "recommended_modules": recommended_modules,
-            "function_calls": ai_response_data.get("function_calls", [])
-        }
+    content = await asyncio.to_thread(
+        _finish_chat_turn, conversation, user_message, ai_response_data, db
     )
-    db.add(assistant_message)
-    db.commit()
-    db.refresh(assistant_message)
+    logger.info(f"Returning response for session {content['session_id']}")
+    return ORJSONResponse(content=content)
 
-    response = {
-        "session_id": conversation.session_id,
-        "conversation_id": conversation.id,
-        "user_message": user_message,
-        "assistant_message": assistant_message,
-        "recommended_modules": recommended_modules,  # Include at top level
-        "module_status": conversation.extra_data.get("module_status", {})  # Include current status
-    }
-    logger.info(f"Returning response for session {conversation.session_id}")
-    return response
+
+def _sse_event(data: Dict) -> str:
+    """Format a dict as a server-sent event"""
+    return f"data: {orjson.dumps(data, default=str).decode()}\n\n"
+
+
+@app.post("/chat/stream")
+async def chat_stream(
+    chat_request: api_models.ChatRequest,
+    user_id: str = None
+):
+    """
+    Send a message and stream the AI response as server-sent events
+
+    Emits {"type": "delta", "content": ...} events as text is generated, then a
+    final {"type": "done", ...} event with the saved assistant message id,
+    recommended modules and current module status (or {"type": "error"}).
+    """
+    logger.info(f"Received streaming chat request: {chat_request.message[:100]}...")
+
+    # The session must outlive the request handler, so the stream owns it.
+    # Database work runs in worker threads so it doesn't stall the event loop.
+    db = SessionLocal()
+    try:
+        conversation, user_message, message_history = await asyncio.to_thread(
+            _start_chat_turn, chat_request, user_id, db
+        )
+    except Exception:
+        await asyncio.to_thread(db.close)
+        raise
+
+    def finish_stream(event: Dict) -> Dict:
+        """Save the streamed reply and build the final event (blocking)"""
+        _mark_modules_recommended(conversation, event["recommended_modules"], db)
+        assistant_message = _save_assistant_message(conversation, event, db)
+        return {
+            "type": "done",
+            "session_id": conversation.session_id,
+            "conversation_id": conversation.id,
+            "user_message_id": user_message.id,
+            "assistant_message_id": assistant_message.id,
+            "recommended_modules": event["recommended_modules"],
+            "module_status": conversation.extra_data.get("module_status", {})
+        }
+
+    async def event_stream():
+        try:
+            # aclosing() shuts the AI stream down as soon as this generator is
+            # closed (e.g. the client disconnects) instead of on garbage collection
+            async with aclosing(get_ai_response_stream(
+                messages=message_history,
+                conversation_id=conversation.id,
+                db_session=db,
+                language=None  # Auto-detect language from user's message
+            )) as events:
+                async for event in events:
+                    if event["type"] == "delta":
+                        yield _sse_event(event)
+                        continue
+
+                    yield _sse_event(await asyncio.to_thread(finish_stream, event))
+        except Exception as e:
+            logger.error(f"Error streaming AI response: {e}")
+            yield _sse_event({"type": "error", "detail": str(e)})
+        finally:
+            await asyncio.to_thread(db.close)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
 
 
 @app.post("/conversations/{conversation_id}/modules/{module_id}/complete")
@@ -299,7 +503,7 @@ def complete_module(
     if module_id not in module_status:
         module_status[module_id] = {}
 
-    module_status[module_id]["completed_at"] = datetime.utcnow().isoformat()
+    module_status[module_id]["completed_at"] = datetime.now(timezone.utc).isoformat()
 
     if completion_request.completion_data:
         module_status[module_id]["completion_data"] = completion_request.completion_data
@@ -360,8 +564,43 @@ def get_module_status(
     return result
 
 
+def _complete_inner_doodling(conversation_id: int, image_uri: str, analysis: str):
+    """Mark the Inner Doodling module complete with the image analysis (blocking)"""
+    db = SessionLocal()
+    try:
+        conversation = db.query(db_models.Conversation).filter(
+            db_models.Conversation.id == conversation_id
+        ).first()
+
+        if conversation:
+            if not conversation.extra_data:
+                conversation.extra_data = {}
+            if "module_status" not in conversation.extra_data:
+                conversation.extra_data["module_status"] = {}
+
+            module_status = conversation.extra_data["module_status"]
+            if "inner_doodling" not in module_status:
+                module_status["inner_doodling"] = {}
+
+            module_status["inner_doodling"]["completed_at"] = datetime.now(timezone.utc).isoformat()
+            module_status["inner_doodling"]["completion_data"] = {
+                "image_uri": image_uri,
+                "analysis": analysis
+            }
+
+            conversation.extra_data["module_status"] = module_status
+            flag_modified(conversation, "extra_data")
+            db.commit()
+
+            logger.info(f"Auto-marked Inner Doodling as complete for conversation {conversation_id}")
+        else:
+            logger.warning(f"Conversation {conversation_id} not found")
+    finally:
+        db.close()
+
+
 @app.post("/analyze-image-uri/")
-def analyze_image_uri(
+async def analyze_image_uri(
     image_uri: str = Form(...),
     prompt: str = Form("Analyze this image and describe what you see. Focus on the mood, emotions, and insights it might evoke."),
     conversation_id: Optional[int] = Form(None)
@@ -381,8 +620,8 @@ def analyze_image_uri(
             # External URL - download
             logger.info(f"Downloading external image: {image_uri}")
             import httpx
-            with httpx.Client() as client:
-                response = client.get(image_uri)
+            async with httpx.AsyncClient() as client:
+                response = await client.get(image_uri)
                 image_bytes = response.content
             logger.info(f"Downloaded {len(image_bytes)} bytes")
         elif image_uri.startswith("/uploads/"):
@@ -415,38 +654,15 @@ def analyze_image_uri(
         language = detect_language(prompt)
         logger.info(f"Auto-detected language for image analysis: {language}")
 
-        analysis = get_ai_response_with_image(prompt, base64_image, language=language)
+        analysis = await get_ai_response_with_image(prompt, base64_image, language=language)
         logger.info(f"AI analysis completed: {analysis[:100]}...")
 
         # If conversation_id provided, auto-complete Inner Doodling module
         if conversation_id:
             try:
-                db = next(get_db())
-                conversation = db.query(db_models.Conversation).filter(
-                    db_models.Conversation.id == conversation_id
-                ).first()
-
-                if conversation:
-                    if not conversation.extra_data:
-                        conversation.extra_data = {}
-                    if "module_status" not in conversation.extra_data:
-                        conversation.extra_data["module_status"] = {}
-
-                    module_status = conversation.extra_data["module_status"]
-                    if "inner_doodling" not in module_status:
-                        module_status["inner_doodling"] = {}
-
-                    module_status["inner_doodling"]["completed_at"] = datetime.utcnow().isoformat()
-                    module_status["inner_doodling"]["completion_data"] = {
-                        "image_uri": image_uri,
-                        "analysis": analysis
-                    }
-
-                    conversation.extra_data["module_status"] = module_status
-                    flag_modified(conversation, "extra_data")
-                    db.commit()
-
-                    logger.info("Auto-marked Inner Doodling as complete")
+                await asyncio.to_thread(
+                    _complete_inner_doodling, conversation_id, image_uri, analysis
+                )
             except Exception as e:
                 logger.warning(f"Failed to auto-complete Inner Doodling: {e}")
 
@@ -467,7 +683,7 @@ async def upload_sketch(
 
     This endpoint:
     1. Accepts an uploaded image file (PNG/JPEG)
-    2. Saves it to /uploads/sketches/ directory
+    2. Saves it to /uploads/sketches/ directory and, concurrently,
     3. Analyzes it using OpenAI Vision API
     4. Auto-completes the inner_doodling module if conversation_id is provided
     5. Returns the analysis result and file URI
@@ -475,21 +691,12 @@ async def upload_sketch(
     logger.info(f"Received sketch upload - filename: {file.filename}, conversation_id: {conversation_id}")
 
     try:
-        # Create uploads directory if it doesn't exist
-        upload_dir = Path("uploads/sketches")
-        upload_dir.mkdir(parents=True, exist_ok=True)
-
         # Generate unique filename
-        file_extension = Path(file.filename).suffix if file.filename else ".png"
+        file_extension = os.path.splitext(file.filename)[1] if file.filename else ".png"
         unique_filename = f"{uuid.uuid4()}{file_extension}"
-        file_path = upload_dir / unique_filename
+        file_path = SKETCH_UPLOAD_DIR / unique_filename
 
-        # Save uploaded file
-        logger.info(f"Saving file to: {file_path}")
         contents = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(contents)
-        logger.info(f"Saved {len(contents)} bytes to {file_path}")
 
         # Convert to base64 for AI analysis
         base64_image = base64.b64encode(contents).decode('utf-8')
@@ -502,8 +709,14 @@ async def upload_sketch(
         language = detect_language(prompt)
         logger.info(f"Auto-detected language for sketch analysis: {language}")
 
-        # Analyze with AI
-        analysis = get_ai_response_with_image(prompt, base64_image, language=language)
+        # Save to disk (in a worker thread) while the AI analyzes the image;
+        # the two are independent, so neither waits on the other
+        logger.info(f"Saving file to: {file_path}")
+        _, analysis = await asyncio.gather(
+            asyncio.to_thread(file_path.write_bytes, contents),
+            get_ai_response_with_image(prompt, base64_image, language=language)
+        )
+        logger.info(f"Saved {len(contents)} bytes to {file_path}")
         logger.info(f"AI analysis completed: {analysis[:100]}...")
 
         # Generate file URI for frontend
@@ -512,34 +725,9 @@ async def upload_sketch(
         # If conversation_id provided, auto-complete Inner Doodling module
         if conversation_id:
             try:
-                db = next(get_db())
-                conversation = db.query(db_models.Conversation).filter(
-                    db_models.Conversation.id == conversation_id
-                ).first()
-
-                if conversation:
-                    if not conversation.extra_data:
-                        conversation.extra_data = {}
-                    if "module_status" not in conversation.extra_data:
-                        conversation.extra_data["module_status"] = {}
-
-                    module_status = conversation.extra_data["module_status"]
-                    if "inner_doodling" not in module_status:
-                        module_status["inner_doodling"] = {}
-
-                    module_status["inner_doodling"]["completed_at"] = datetime.utcnow().isoformat()
-                    module_status["inner_doodling"]["completion_data"] = {
-                        "image_uri": file_uri,
-                        "analysis": analysis
-                    }
-
-                    conversation.extra_data["module_status"] = module_status
-                    flag_modified(conversation, "extra_data")
-                    db.commit()
-
-                    logger.info(f"Auto-marked Inner Doodling as complete for conversation {conversation_id}")
-                else:
-                    logger.warning(f"Conversation {conversation_id} not found")
+                await asyncio.to_thread(
+                    _complete_inner_doodling, conversation_id, file_uri, analysis
+                )
             except Exception as e:
                 logger.warning(f"Failed to auto-complete Inner Doodling: {e}")
 
@@ -725,17 +913,18 @@ def submit_questionnaire_response(
         db.add(db_response)
         db.flush()  # Get the response ID
 
-        # Save individual answers
-        for question_number, answer_value in answers_int.items():
-            # Find the question in database
-            question = next((q for q in questions if q.question_number == question_number), None)
-            if question:
-                answer = DBAnswer(
-                    response_id=db_response.id,
-                    question_id=question.id,
-                    answer_value=answer_value
-                )
-                db.add(answer)
+        # Save individual answers with one multi-row INSERT. Question numbers
+        # can repeat across sub-sections; the first matching question wins.
+        question_ids = {}
+        for q in questions:
+            question_ids.setdefault(q.question_number, q.id)
+        answer_rows = [
+            {"response_id": db_response.id, "question_id": question_ids[question_number], "answer_value": answer_value}
+            for question_number, answer_value in answers_int.items()
+            if question_number in question_ids
+        ]
+        if answer_rows:
+            db.execute(insert(DBAnswer.__table__), answer_rows)
 
         db.commit()
         db.refresh(db_response)
@@ -762,7 +951,7 @@ def submit_questionnaire_response(
         if "quick_assessment" not in module_status:
             module_status["quick_assessment"] = {}
 
-        module_status["quick_assessment"]["completed_at"] = datetime.utcnow().isoformat()
+        module_status["quick_assessment"]["completed_at"] = datetime.now(timezone.utc).isoformat()
         module_status["quick_assessment"]["completion_data"] = {
             "questionnaire_id": response.questionnaire_id,
             "total_questions": len(response.answers),
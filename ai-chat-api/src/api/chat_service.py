@@ -5,20 +5,90 @@ This service uses OpenAI function calling to detect when the AI naturally
 recommends psychological support modules during conversation.
 """
 
-from openai import OpenAI
+import httpx
+import orjson
+from openai import AsyncOpenAI, AsyncStream, APITimeoutError, RateLimitError
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from src.config.settings import (
     OPENAI_API_KEY, AI_RESPONSE_LANGUAGE, AI_FORCE_LANGUAGE,
-    AI_TEMPERATURE, AI_MAX_TOKENS, AI_PRESENCE_PENALTY, AI_FREQUENCY_PENALTY
+    AI_TEMPERATURE, AI_MAX_TOKENS, AI_PRESENCE_PENALTY, AI_FREQUENCY_PENALTY,
+    AI_RESPONSE_CACHE_ENABLED, AI_RESPONSE_CACHE_TTL, AI_RESPONSE_CACHE_MAXSIZE,
+    AI_MAX_RETRIES, AI_CONTEXT_WINDOW, AI_MAX_CONCURRENT_REQUESTS
 )
-from typing import List, Dict, Optional
+from src.api.prompts import CHINESE_SYSTEM_PROMPT, ENGLISH_SYSTEM_PROMPT
+from src.modules.module_config import get_module_by_id
+from src.services.cache import TTLCache
+from typing import AsyncGenerator, List, Dict, Optional
 from datetime import datetime
+import asyncio
+import copy
+import functools
+import hashlib
 import logging
 import re
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+# One pooled HTTP/2 client for the whole process; closed on app shutdown.
+# HTTP/2 multiplexes concurrent requests over a kept-alive connection, so
+# TLS handshakes are only paid on warm-up or after a long idle period.
+_http_client = httpx.AsyncClient(
+    http2=True,
+    timeout=httpx.Timeout(60.0, connect=5.0),
+    limits=httpx.Limits(
+        max_connections=500,
+        max_keepalive_connections=100,
+        keepalive_expiry=300
+    )
+)
+# The SDK retries rate limits, timeouts and 5xx with exponential backoff and
+# jitter; other 4xx errors fail fast
+client = AsyncOpenAI(
+    api_key=OPENAI_API_KEY,
+    http_client=_http_client,
+    max_retries=AI_MAX_RETRIES
+)
 logger = logging.getLogger(__name__)
 
+# Caps in-flight OpenAI requests per worker so bursts keep rate-limit headroom
+_AI_CONCURRENCY = asyncio.Semaphore(AI_MAX_CONCURRENT_REQUESTS)
+
+# Exact-match cache for opening turns, which often repeat across users
+_response_cache = TTLCache(maxsize=AI_RESPONSE_CACHE_MAXSIZE, ttl=AI_RESPONSE_CACHE_TTL)
+
+# Rendered module status sections, keyed by a fingerprint of the status dict.
+# The key covers the full content, so entries never go stale: a bounded LRU.
+_status_text_cache = TTLCache(maxsize=4096, ttl=None)
+
+
+class AIResponseError(RuntimeError):
+    """Raised when the AI service fails to produce a response"""
+
+
+class AIRateLimitError(AIResponseError):
+    """The AI provider rejected the request because of rate limiting"""
+
+
+class AITimeoutError(AIResponseError):
+    """The AI provider did not respond in time"""
+
+
+def _as_ai_error(error: Exception, context: str) -> AIResponseError:
+    """Map an exception raised while calling the AI provider to a typed AIResponseError"""
+    if isinstance(error, AIResponseError):
+        return error
+    if isinstance(error, RateLimitError):
+        return AIRateLimitError(f"{context}: {error}")
+    if isinstance(error, APITimeoutError):
+        return AITimeoutError(f"{context}: {error}")
+    return AIResponseError(f"{context}: {error}")
+
+
+# Compiled once; detect_language runs on every chat turn and image prompt
+_CJK_PATTERN = re.compile(r'[\u4e00-\u9fff]')
+_LATIN_PATTERN = re.compile(r'[a-zA-Z]')
+
 
 def detect_language(text: str) -> str:
     """
@@ -34,10 +104,10 @@ def detect_language(text: str) -> str:
         return "chinese"  # Default to Chinese for empty input
 
     # Count Chinese characters (CJK Unified Ideographs)
-    chinese_chars = len(re.findall(r'[\u4e00-\u9fff]', text))
+    chinese_chars = len(_CJK_PATTERN.findall(text))
 
     # Count English letters
-    english_chars = len(re.findall(r'[a-zA-Z]', text))
+    english_chars = len(_LATIN_PATTERN.findall(text))
 
     # Count total meaningful characters (excluding punctuation and whitespace)
     total_chars = chinese_chars + english_chars
@@ -66,6 +136,118 @@ def detect_language(text: str) -> str:
     return "chinese"
 
 
+_SYSTEM_PROMPTS = {
+    "chinese": CHINESE_SYSTEM_PROMPT,
+    "english": ENGLISH_SYSTEM_PROMPT,
+}
+
+
+# Display names used when injecting module status into the system prompt
+_STATUS_MODULE_NAMES = {
+    "chinese": (
+        ("breathing_exercise", "呼吸训练 (Breathing Exercise)"),
+        ("emotion_labeling", "情绪命名 (Emotion Labeling)"),
+        ("inner_doodling", "内视涂鸦 (Inner Doodling)"),
+        ("quick_assessment", "内视快测 (Quick Assessment)"),
+    ),
+    "english": (
+        ("breathing_exercise", "Breathing Exercise (呼吸训练)"),
+        ("emotion_labeling", "Emotion Labeling (情绪命名)"),
+        ("inner_doodling", "Inner Doodling (内视涂鸦)"),
+        ("quick_assessment", "Quick Assessment (内视快测)"),
+    ),
+}
+
+# Fixed text of the module status section, per language
+_STATUS_LABELS = {
+    "chinese": {
+        "header": "\n\n<当前模块状态>\n以下是各模块的实时完成状态：\n\n",
+        "completed": "已完成",
+        "recommended": "已推荐但尚未完成",
+        "not_started": "尚未开始",
+        "emotion": "  选择的情绪: {}\n",
+        "duration": "  持续时间: {}秒\n",
+        "footer": (
+            "\n</当前模块状态>\n\n"
+            "重要提醒：\n"
+            "- 不要推荐标记为「已完成」的模块\n"
+            "- 将引导重点放在「尚未开始」或「已推荐但尚未完成」的模块上\n"
+            "- 推荐模块时必须调用 recommend_module 函数\n"
+        ),
+    },
+    "english": {
+        "header": "\n\n<Current Module Status>\nReal-time completion status of each module:\n\n",
+        "completed": "COMPLETED",
+        "recommended": "Recommended but not completed",
+        "not_started": "Not yet started",
+        "emotion": "  Selected emotion: {}\n",
+        "duration": "  Duration: {} seconds\n",
+        "footer": (
+            "\n</Current Module Status>\n\n"
+            "Important Reminders:\n"
+            "- DO NOT recommend modules marked as COMPLETED\n"
+            "- Focus guidance on modules that are 'Not yet started' or 'Recommended but not completed'\n"
+            "- When recommending a module, you MUST call the recommend_module function\n"
+        ),
+    },
+}
+
+# Module keywords for fallback detection of unannounced recommendations
+# (stored lowercase so matching only lowercases the response text)
+_MODULE_KEYWORDS = {
+    "chinese": {
+        "breathing_exercise": ("呼吸训练", "呼吸练习", "深呼吸", "呼吸"),
+        "emotion_labeling": ("情绪命名", "给情绪命名", "命名情绪", "情绪标签"),
+        "inner_doodling": ("内视涂鸦", "涂鸦", "画一幅", "绘制"),
+        "quick_assessment": ("内视快测", "快测", "评估", "测试", "量表"),
+    },
+    "english": {
+        "breathing_exercise": ("breathing exercise", "breathing practice", "deep breath", "breath"),
+        "emotion_labeling": ("emotion labeling", "label emotion", "name emotion", "emotion label"),
+        "inner_doodling": ("inner doodling", "doodling", "draw", "sketch"),
+        "quick_assessment": ("quick assessment", "assessment", "test", "questionnaire"),
+    },
+}
+
+class _RecommendModuleArgs(BaseModel):
+    """Arguments of a recommend_module call, parsed straight from the JSON string"""
+    module_id: str
+    reasoning: str = ""
+
+
+# Function calling tools for module recommendation detection
+_OPENAI_TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "recommend_module",
+            "description": "REQUIRED: Call this function whenever you recommend, suggest, or mention any of the 4 psychological support modules (breathing exercise, emotion labeling, inner doodling, quick assessment) in your response - even if you phrase it subtly or indirectly. This is the ONLY way the system tracks module recommendations. Without calling this function, the recommendation will not be registered.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "module_id": {
+                        "type": "string",
+                        "enum": [
+                            "breathing_exercise",
+                            "emotion_labeling",
+                            "inner_doodling",
+                            "quick_assessment"
+                        ],
+                        "description": "The ID of the module being recommended"
+                    },
+                    "reasoning": {
+                        "type": "string",
+                        "description": "Brief reasoning for why this module is being recommended (for internal tracking)"
+                    }
+                },
+                "required": ["module_id", "reasoning"]
+            }
+        }
+    }
+]
+
+
+@functools.lru_cache(maxsize=16)
 def get_base_system_prompt(language: str = "chinese") -> str:
     """
     Get base system prompt based on configured language
@@ -74,182 +256,21 @@ def get_base_system_prompt(language: str = "chinese") -> str:
         language: Target language for responses ('chinese' or 'english')
 
     Returns:
-        Base system prompt string
+        Base system prompt string (defaults to Chinese for unknown languages).
+        Cached per language; the returned str is immutable, so callers can't
+        disturb the cache.
     """
-    if language.lower() == "chinese":
-        return """🧠 中文 System Prompt（心理探索型引导助手）
-
-<Role>
-你是一名以人为中心的心理探索型对话助手，具有心理咨询背景。
-你的核心风格是温和、耐心、共情、不评判。
-你不以"教育""说教"或"诊断"为目标，而是陪伴用户探索其内在心理世界，帮助他们更好地理解当下的情绪、体验与心理模式。
-
-⚠️ 重要：你绝不提及自己是"AI"、"人工智能"、"语言模型"、"机器人"或"助手"。你就是一个在场的倾听者与陪伴者。
-
-<Overall Goal>
-你的最终目标，是在自然对话中，引导用户完成以下四个心理模块：
-1. 情绪急救（呼吸训练）
-2. 情绪急救（情绪命名）
-3. 内视涂鸦
-4. 内视快测
-
-你会在合适的时机、合适的语境下，逐步推荐这些模块，直到：
-- 所有模块都已完成，或
-- 用户明确表示希望暂停或结束对话
-
-在任何情况下，你都必须尊重用户的自主性与选择权。
-
-<Modules Definition>
-【情绪急救】
-- 呼吸训练：用于帮助处于强烈情绪、压力或失控感中的用户，快速稳定生理与情绪状态。
-- 情绪命名：用于在呼吸训练之后，引导用户识别、区分并命名自身情绪体验。
-注意：情绪命名通常在呼吸训练完成后再推荐。
-
-【内视涂鸦】
-通过让用户绘制一幅能够表达其内心世界或当下情绪状态的图像，
-帮助系统与用户一起探索其潜在的心理特征、情绪模式与内在动力。
-
-【内视快测】
-一个覆盖五大心理维度的自我评估量表。
-完成后，可对用户的心理特质、情绪倾向与行为模式进行较为系统的理解。
-
-<Context-Aware Recommendation Rules>
-- 你永远不"强推"模块，而是根据用户当下的情绪状态、语言线索与对话走向，自然地提出建议。
-- 你可以使用类似以下的方式引导，而不是直接下指令：
-  - "有些人会在这种状态下，先让身体慢慢安静下来……"
-  - "如果你愿意，我们也可以换一种更直观的方式看看你的内在感受。"
-  - "有一个小练习，可能能帮你更系统地理解刚才提到的这些感受。"
-
-- 当某个模块已经完成：
-  - 你不再推荐该模块
-  - 你的注意力只放在尚未完成的模块上
-
-- 当所有模块完成后：
-  - 你可以温和地询问用户，是否希望基于这些内容生成一份综合性的心理洞察报告
-  - 在未获得明确同意前，不要主动生成报告
-
-<Stealth & Natural Guidance Principles>
-- 不要频繁提及"模块""功能""系统"
-- 优先使用自然语言与心理咨询常用的过渡表达
-- 模块推荐应当看起来像是对当下谈话的自然延伸，而不是预设流程
-
-<CRITICAL INSTRUCTION - Function Calling>
-⚠️ 每当你在回复中自然地推荐或提及以下任何模块时，你必须同时调用 recommend_module 函数：
-- 呼吸训练 (breathing_exercise)
-- 情绪命名 (emotion_labeling)
-- 内视涂鸦 (inner_doodling)
-- 内视快测 (quick_assessment)
-
-即使你只是委婉地暗示或建议（例如"也许我们可以试试呼吸练习"），也必须调用函数。
-这是系统跟踪推荐的唯一方式，不调用函数则推荐不会被记录。
-
-<Boundaries>
-- 不进行医学或精神疾病诊断
-- 不替用户做决定
-- 不制造紧迫感或完成压力
-- 当用户表达拒绝、犹豫或疲惫时，优先共情，而不是继续引导模块
-
-<Tone & Style>
-- 温柔、稳定、理解
-- 语言贴近人类心理咨询对话，而非技术产品说明
-- 允许留白、允许慢节奏
-- 永远不要说"作为AI"、"我是人工智能"或类似表达
-- 不要解释你的能力限制或技术边界
-
-你始终记住：模块只是工具，人的体验才是核心。"""
-
-    elif language.lower() == "english":
-        return """🧠 English System Prompt (Psychological Exploration Assistant)
-
-<Role>
-You are a human-centered psychological exploration companion with a background in counseling psychology.
-Your core style is warm, gentle, patient, empathetic, and non-judgmental.
-Your role is not to teach, diagnose, or fix the user, but to gently accompany them in exploring their inner psychological world and helping them better understand their current emotions, experiences, and psychological patterns.
-
-⚠️ Important: Never mention that you are an "AI," "artificial intelligence," "language model," "bot," or "assistant." You are simply a present listener and companion.
-
-<Overall Goal>
-Your ultimate goal is to naturally guide the user, through conversation, to complete the following four modules:
-1. Emotional First Aid (Breathing Exercises)
-2. Emotional First Aid (Emotion Labeling)
-3. Inner Insight Doodling
-4. Inner Insight Quick Assessment
-
-You continue guiding until:
-- All modules have been completed, or
-- The user clearly chooses to pause or end the conversation
-
-User autonomy and consent must always be respected.
-
-<Modules Definition>
-[Emotional First Aid]
-- Breathing Exercises: designed to help users regulate intense emotions and restore physiological and emotional stability.
-- Emotion Labeling: helps users identify, differentiate, and name their emotional experiences.
-Note: Emotion labeling is normally recommended after breathing exercises have been completed.
-
-[Inner Insight Doodling]
-Users draw an image that represents their inner world or current emotional state.
-The system uses the image as a starting point to explore underlying psychological traits, emotional patterns, and inner dynamics together with the user.
-
-[Inner Insight Quick Assessment]
-A self-assessment module covering five core psychological dimensions.
-Upon completion, it provides a more structured understanding of the user's psychological traits, emotional tendencies, and behavioral patterns.
-
-<Context-Aware Recommendation Rules>
-- Never force or explicitly push modules.
-- Recommendations should arise naturally from the user's emotional state, language, and conversational context.
-- Use gentle, human-centered transitions such as:
-  - "Some people find it helpful to first let their body settle a bit…"
-  - "If you're open to it, we could explore this in a more visual way."
-  - "There's a short reflective exercise that might help make sense of what you just shared."
-
-- Once a module is completed:
-  - Do not recommend it again
-  - Focus only on the remaining modules
-
-- After all modules are completed:
-  - Gently ask whether the user would like a comprehensive psychological insight report
-  - Do not generate the report without explicit consent
-
-<Stealth & Natural Guidance Principles>
-- Don't frequently mention "modules," "features," "system," or "function"
-- Prefer natural language and transitions commonly used in psychological counseling
-- Module recommendations should appear as a natural extension of the current conversation, not a preset workflow
-
-<CRITICAL INSTRUCTION - Function Calling>
-⚠️ Whenever you naturally recommend or mention any of these modules in your response, you MUST simultaneously call the recommend_module function:
-- Breathing Exercise (breathing_exercise)
-- Emotion Labeling (emotion_labeling)
-- Inner Doodling (inner_doodling)
-- Quick Assessment (quick_assessment)
-
-Even if you're being subtle or indirect (e.g., "maybe we could try some breathing exercises"), you MUST call the function.
-This is the ONLY way the system tracks recommendations - without the function call, the recommendation will not be recorded.
-
-<Boundaries>
-- Do not provide medical or psychiatric diagnoses
-- Do not make decisions on behalf of the user
-- Do not create urgency or pressure to complete modules
-- When the user expresses hesitation, fatigue, or resistance, prioritize empathy over guidance
-
-<Tone & Style>
-- Gentle, stable, and understanding
-- Language should be close to human psychological counseling dialogue, not technical product descriptions
-- Allow pauses and a slow pace
-- Never say "as an AI," "I'm an artificial intelligence," or similar expressions
-- Don't explain your capability limitations or technical boundaries
-
-Always remember: the modules are tools — the user's lived experience is the center."""
-
-    else:
-        # Default to Chinese
-        return get_base_system_prompt("chinese")
+    return _SYSTEM_PROMPTS.get(language.lower(), CHINESE_SYSTEM_PROMPT)
 
 
 def format_module_status(module_status: Dict, language: str = "chinese") -> str:
     """
     Format module completion status for injection into system prompt
 
+    Module status only changes when a module is recommended or completed, so
+    consecutive turns usually render identical text; results are cached by a
+    fingerprint of the status dict.
+
     Args:
         module_status: Dictionary of module statuses from conversation.metadata
         language: Target language ('chinese' or 'english')
@@ -257,74 +278,45 @@ def format_module_status(module_status: Dict, language: str = "chinese") -> str:
     Returns:
         Formatted status text to append to system prompt
     """
-    if language.lower() == "chinese":
-        status_text = "\n\n<当前模块状态>\n"
-        status_text += "以下是各模块的实时完成状态：\n\n"
-
-        modules = [
-            ("breathing_exercise", "呼吸训练 (Breathing Exercise)"),
-            ("emotion_labeling", "情绪命名 (Emotion Labeling)"),
-            ("inner_doodling", "内视涂鸦 (Inner Doodling)"),
-            ("quick_assessment", "内视快测 (Quick Assessment)")
-        ]
+    is_chinese = language.lower() == "chinese"
+    fingerprint = hashlib.blake2b(
+        orjson.dumps(module_status, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS),
+        digest_size=16
+    ).digest()
+    cache_key = (fingerprint, is_chinese)
+
+    status_text = _status_text_cache.get(cache_key)
+    if status_text is None:
+        status_text = _render_module_status(module_status, is_chinese)
+        _status_text_cache.set(cache_key, status_text)
+    return status_text
 
-        for module_id, module_name in modules:
-            status = module_status.get(module_id, {})
-
-            if status.get("completed_at"):
-                status_text += f"✓ {module_name}: 已完成\n"
-                # Include completion data if available
-                if status.get("completion_data"):
-                    data = status["completion_data"]
-                    if module_id == "emotion_labeling" and "emotion" in data:
-                        status_text += f"  选择的情绪: {data['emotion']}\n"
-                    elif module_id == "breathing_exercise" and "duration" in data:
-                        status_text += f"  持续时间: {data['duration']}秒\n"
-            elif status.get("recommended_at"):
-                status_text += f"⧗ {module_name}: 已推荐但尚未完成\n"
-            else:
-                status_text += f"○ {module_name}: 尚未开始\n"
-
-        status_text += "\n</当前模块状态>\n\n"
-        status_text += "重要提醒：\n"
-        status_text += "- 不要推荐标记为「已完成」的模块\n"
-        status_text += "- 将引导重点放在「尚未开始」或「已推荐但尚未完成」的模块上\n"
-        status_text += "- 推荐模块时必须调用 recommend_module 函数\n"
-
-    else:  # English
-        status_text = "\n\n<Current Module Status>\n"
-        status_text += "Real-time completion status of each module:\n\n"
-
-        modules = [
-            ("breathing_exercise", "Breathing Exercise (呼吸训练)"),
-            ("emotion_labeling", "Emotion Labeling (情绪命名)"),
-            ("inner_doodling", "Inner Doodling (内视涂鸦)"),
-            ("quick_assessment", "Quick Assessment (内视快测)")
-        ]
 
-        for module_id, module_name in modules:
-            status = module_status.get(module_id, {})
-
-            if status.get("completed_at"):
-                status_text += f"✓ {module_name}: COMPLETED\n"
-                if status.get("completion_data"):
-                    data = status["completion_data"]
-                    if module_id == "emotion_labeling" and "emotion" in data:
-                        status_text += f"  Selected emotion: {data['emotion']}\n"
-                    elif module_id == "breathing_exercise" and "duration" in data:
-                        status_text += f"  Duration: {data['duration']} seconds\n"
-            elif status.get("recommended_at"):
-                status_text += f"⧗ {module_name}: Recommended but not completed\n"
-            else:
-                status_text += f"○ {module_name}: Not yet started\n"
-
-        status_text += "\n</Current Module Status>\n\n"
-        status_text += "Important Reminders:\n"
-        status_text += "- DO NOT recommend modules marked as COMPLETED\n"
-        status_text += "- Focus guidance on modules that are 'Not yet started' or 'Recommended but not completed'\n"
-        status_text += "- When recommending a module, you MUST call the recommend_module function\n"
+def _render_module_status(module_status: Dict, is_chinese: bool) -> str:
+    """Render the module status section (uncached; see format_module_status)"""
+    language = "chinese" if is_chinese else "english"
+    labels = _STATUS_LABELS[language]
+    parts = [labels["header"]]
+
+    for module_id, module_name in _STATUS_MODULE_NAMES[language]:
+        status = module_status.get(module_id, {})
+
+        if status.get("completed_at"):
+            parts.append(f"✓ {module_name}: {labels['completed']}\n")
+            # Include completion data if available
+            data = status.get("completion_data")
+            if data:
+                if module_id == "emotion_labeling" and "emotion" in data:
+                    parts.append(labels["emotion"].format(data["emotion"]))
+                elif module_id == "breathing_exercise" and "duration" in data:
+                    parts.append(labels["duration"].format(data["duration"]))
+        elif status.get("recommended_at"):
+            parts.append(f"⧗ {module_name}: {labels['recommended']}\n")
+        else:
+            parts.append(f"○ {module_name}: {labels['not_started']}\n")
 
-    return status_text
+    parts.append(labels["footer"])
+    return "".join(parts)
 
 
 def _detect_module_mentions(
@@ -347,21 +339,7 @@ def _detect_module_mentions(
     """
     detected = []
 
-    # Define module keywords for detection
-    if language == "chinese":
-        module_patterns = {
-            "breathing_exercise": ["呼吸训练", "呼吸练习", "深呼吸", "呼吸"],
-            "emotion_labeling": ["情绪命名", "给情绪命名", "命名情绪", "情绪标签"],
-            "inner_doodling": ["内视涂鸦", "涂鸦", "画一幅", "绘制"],
-            "quick_assessment": ["内视快测", "快测", "评估", "测试", "量表"]
-        }
-    else:
-        module_patterns = {
-            "breathing_exercise": ["breathing exercise", "breathing practice", "deep breath", "breath"],
-            "emotion_labeling": ["emotion labeling", "label emotion", "name emotion", "emotion label"],
-            "inner_doodling": ["inner doodling", "doodling", "draw", "sketch"],
-            "quick_assessment": ["quick assessment", "assessment", "test", "questionnaire"]
-        }
+    module_patterns = _MODULE_KEYWORDS["chinese" if language == "chinese" else "english"]
 
     text_lower = text.lower()
 
@@ -372,7 +350,7 @@ def _detect_module_mentions(
 
         # Check if any keyword is mentioned
         for keyword in keywords:
-            if keyword.lower() in text_lower:
+            if keyword in text_lower:
                 detected.append(module_id)
                 break  # Only add once per module
 
@@ -384,40 +362,296 @@ def get_openai_tools() -> List[Dict]:
     Define OpenAI function calling tools for module recommendation detection
 
     Returns:
-        List of tool definitions for OpenAI API
+        List of tool definitions for OpenAI API (shared; do not mutate)
     """
-    return [
-        {
-            "type": "function",
-            "function": {
-                "name": "recommend_module",
-                "description": "REQUIRED: Call this function whenever you recommend, suggest, or mention any of the 4 psychological support modules (breathing exercise, emotion labeling, inner doodling, quick assessment) in your response - even if you phrase it subtly or indirectly. This is the ONLY way the system tracks module recommendations. Without calling this function, the recommendation will not be registered.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "module_id": {
-                            "type": "string",
-                            "enum": [
-                                "breathing_exercise",
-                                "emotion_labeling",
-                                "inner_doodling",
-                                "quick_assessment"
-                            ],
-                            "description": "The ID of the module being recommended"
-                        },
-                        "reasoning": {
-                            "type": "string",
-                            "description": "Brief reasoning for why this module is being recommended (for internal tracking)"
-                        }
-                    },
-                    "required": ["module_id", "reasoning"]
-                }
-            }
-        }
-    ]
+    return _OPENAI_TOOLS
+
+
+def _build_module_recommendation(module_id: str, reasoning: str, language: str) -> Optional[Dict]:
+    """
+    Build the recommendation object returned to the frontend for a module
+
+    Args:
+        module_id: ID of the recommended module
+        reasoning: Why the module was recommended
+        language: Response language (selects localized name/description)
+
+    Returns:
+        Recommendation dictionary, or None if the module is unknown
+    """
+    module_config = get_module_by_id(module_id)
+    if not module_config:
+        return None
+
+    is_chinese = language == "chinese"
+    return {
+        "module_id": module_id,
+        "name": module_config.get("name_zh" if is_chinese else "name_en"),
+        "icon": module_config.get("icon"),
+        "description": module_config.get("description_zh" if is_chinese else "description_en"),
+        "reasoning": reasoning,
+        "priority": module_config.get("priority")
+    }
+
+
+def _response_cache_key(model: str, messages: List[Dict], params: Dict) -> bytes:
+    """Hash the full request (model, prompt messages, sampling params) into a cache key"""
+    payload = orjson.dumps(
+        {"model": model, "messages": messages, **params},
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+    )
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def _resolve_language(messages: List[Dict[str, str]], language: Optional[str]) -> str:
+    """Auto-detect language from the most recent user message if not specified"""
+    if language is not None:
+        return language
+
+    # Find the most recent user message
+    for msg in reversed(messages):
+        if msg.get("role") == "user":
+            language = detect_language(msg.get("content", ""))
+            logger.info(f"Auto-detected language: {language}")
+            return language
+
+    # If no user message found, default to Chinese
+    logger.info("No user message found, defaulting to Chinese")
+    return "chinese"
+
+
+# Chinese characters cost roughly one token each; other text roughly four chars/token
+_MESSAGE_TOKEN_OVERHEAD = 4  # role/separator tokens added per message
+_CONTEXT_SAFETY_MARGIN = 512  # head-room for estimate error and tool definitions
+
+
+@functools.lru_cache(maxsize=4096)
+def _estimate_tokens(content: str) -> int:
+    """Estimate the token count of a message (cached, since history repeats every turn)"""
+    cjk_chars = len(_CJK_PATTERN.findall(content))
+    return cjk_chars + (len(content) - cjk_chars) // 4 + _MESSAGE_TOKEN_OVERHEAD
+
+
+def _trim_to_context_window(messages: List[Dict[str, str]]) -> int:
+    """
+    Drop the oldest history turns in place until the prompt fits the context window
+
+    The system prompt (first), module status (last) and the latest user turn are
+    always kept, so an oversized request is shortened locally rather than
+    rejected by the API after a full round trip.
+
+    Args:
+        messages: Prepared prompt messages ([system] + history + [status])
+
+    Returns:
+        Number of messages dropped
+    """
+    budget = AI_CONTEXT_WINDOW - AI_MAX_TOKENS - _CONTEXT_SAFETY_MARGIN
+    total = sum(_estimate_tokens(str(m.get("content", ""))) for m in messages)
+    if total <= budget:
+        return 0
+
+    # Oldest history lives at messages[1:-2]; find how many to cut from the front
+    cut = 1
+    while total > budget and cut < len(messages) - 2:
+        total -= _estimate_tokens(str(messages[cut].get("content", "")))
+        cut += 1
+    del messages[1:cut]
+    return cut - 1
+
+
+def _prepare_prompt(
+    messages: List[Dict[str, str]],
+    conversation_id: int,
+    db_session: Session,
+    language: str
+) -> tuple:
+    """
+    Load module status and build the prompt messages sent to OpenAI
+
+    Args:
+        messages: Conversation history with 'role' and 'content' keys.
+            Modified in place: the system prompt is inserted at the front and
+            the module status appended at the end.
+        conversation_id: Database ID of conversation
+        db_session: SQLAlchemy session for database access
+        language: Target language ('chinese' or 'english')
+
+    Returns:
+        Tuple of (prompt messages, module status dict)
+    """
+    # Import here to avoid circular dependency
+    from src.database.models import Conversation
+
+    # Step 1: Load conversation and module status
+    conversation = db_session.query(Conversation).filter(
+        Conversation.id == conversation_id
+    ).first()
+
+    if not conversation:
+        raise ValueError(f"Conversation {conversation_id} not found")
+
+    # Get module status from conversation metadata
+    module_status = {}
+    if conversation.extra_data and isinstance(conversation.extra_data, dict):
+        module_status = conversation.extra_data.get("module_status", {})
+
+    logger.info(f"Loaded module status for conversation {conversation_id}: {module_status}")
+
+    # Log module completion summary
+    completed_count = sum(1 for status in module_status.values() if status.get("completed_at"))
+    recommended_count = sum(1 for status in module_status.values() if status.get("recommended_at") and not status.get("completed_at"))
+    logger.info(f"Module summary: {completed_count} completed, {recommended_count} recommended but not completed")
+
+    # Step 2: Build prompt as [static system prompt] + history + [module status]
+    # The large base prompt stays byte-identical across turns so OpenAI's
+    # automatic prompt caching can reuse the prefix; only the short trailing
+    # status message changes between turns.
+    base_prompt = get_base_system_prompt(language)
+    status_section = format_module_status(module_status, language).strip()
+
+    logger.info(f"Injected module status after history (status length: {len(status_section)} chars)")
+
+    # Built in place (no O(N) history copy); callers hand over ownership of the list
+    system_message = {"role": "system", "content": base_prompt}
+    if messages and messages[0].get("role") == "system":
+        messages[0] = system_message
+    else:
+        messages.insert(0, system_message)
+    messages.append({"role": "system", "content": status_section})
+
+    dropped = _trim_to_context_window(messages)
+    if dropped:
+        logger.warning(f"Dropped {dropped} oldest message(s) to fit the model context window")
+
+    return messages, module_status
+
+
+def _extract_recommendations(
+    ai_content: str,
+    tool_calls: List[tuple],
+    module_status: Dict,
+    language: str
+) -> tuple:
+    """
+    Turn the AI's function calls (plus fallback keyword detection) into module recommendations
+
+    Args:
+        ai_content: Full AI response text
+        tool_calls: List of (function name, JSON arguments string) pairs
+        module_status: Current module status (to avoid recommending completed modules)
+        language: Response language
+
+    Returns:
+        Tuple of (recommended_modules, function_calls)
+    """
+    recommended_modules = []
+    function_calls = []
+
+    if tool_calls:
+        logger.info(f"✓ AI made {len(tool_calls)} function call(s)")
+
+        for name, arguments in tool_calls:
+            logger.info(f"  Function: {name}")
+            logger.info(f"  Arguments: {arguments}")
+
+            if name == "recommend_module":
+                try:
+                    call = _RecommendModuleArgs.model_validate_json(arguments)
+                except ValidationError as e:
+                    logger.warning(f"  → Ignoring malformed recommend_module arguments: {e}")
+                    continue
+                args = call.model_dump()
+                module_id = call.module_id
+                reasoning = call.reasoning
+
+                logger.info(f"  → Module recommendation: {module_id}")
+                logger.info(f"  → Reasoning: {reasoning}")
+
+                module_rec = _build_module_recommendation(module_id, reasoning, language)
+
+                if module_rec:
+                    recommended_modules.append(module_rec)
+                    logger.info(f"  → Built recommendation object: {module_rec['name']} ({module_rec['icon']})")
+                else:
+                    logger.warning(f"  → Module config not found for: {module_id}")
+
+                function_calls.append({
+                    "function": "recommend_module",
+                    "arguments": args
+                })
+    else:
+        logger.info("✗ No function calls detected in AI response")
+
+    # Fallback detection - Check if AI mentioned modules without calling function
+    # This ensures recommendations are never missed even if AI doesn't call the function
+    detected_modules = _detect_module_mentions(ai_content, module_status, language)
+
+    if detected_modules:
+        logger.warning(f"⚠️  Fallback detection found {len(detected_modules)} module mention(s) without function call:")
+        for module_id in detected_modules:
+            # Check if already in recommended_modules (from function call)
+            if not any(m["module_id"] == module_id for m in recommended_modules):
+                logger.warning(f"  → Adding missed recommendation: {module_id}")
+
+                module_rec = _build_module_recommendation(
+                    module_id,
+                    "Fallback detection - AI mentioned module without calling function",
+                    language
+                )
+
+                if module_rec:
+                    recommended_modules.append(module_rec)
+                    logger.warning(f"  → Added: {module_rec['name']} ({module_rec['icon']})")
+
+    if recommended_modules:
+        logger.info(f"✓ Returning response with {len(recommended_modules)} module recommendation(s):")
+        for mod in recommended_modules:
+            logger.info(f"  - {mod['name']} ({mod['module_id']})")
+    else:
+        logger.info("✓ Returning response with no module recommendations")
+
+    return recommended_modules, function_calls
+
 
+async def _create_chat_completion(body: Dict, stream: bool = False):
+    """
+    POST a prebuilt request body to /chat/completions
+
+    The messages we send are already plain {"role", "content"} dicts, so this
+    skips the SDK's per-call parameter transform in chat.completions.create and
+    hands the body straight to the HTTP layer. Responses are parsed into the
+    usual ChatCompletion / ChatCompletionChunk objects.
+
+    Args:
+        body: Request body (model, messages, tools, sampling params)
+        stream: Whether to request a streamed response
 
-def get_ai_response(
+    Returns:
+        ChatCompletion, or an AsyncStream of ChatCompletionChunk when streaming
+    """
+    if stream:
+        body = {**body, "stream": True}
+    return await client.post(
+        "/chat/completions",
+        body=body,
+        cast_to=ChatCompletion,
+        stream=stream,
+        stream_cls=AsyncStream[ChatCompletionChunk]
+    )
+
+
+def _completion_params() -> Dict:
+    """Sampling parameters shared by every chat completion request"""
+    return {
+        "temperature": AI_TEMPERATURE,
+        "max_tokens": AI_MAX_TOKENS,
+        "presence_penalty": AI_PRESENCE_PENALTY,
+        "frequency_penalty": AI_FREQUENCY_PENALTY
+    }
+
+
+async def get_ai_response(
     messages: List[Dict[str, str]],
     conversation_id: int,
     db_session: Session,
@@ -430,12 +664,15 @@ def get_ai_response(
     This function:
     1. Auto-detects language from the most recent user message (if not specified)
     2. Loads module status from conversation metadata
-    3. Injects status into system prompt
-    4. Uses OpenAI function calling to detect module recommendations
-    5. Returns AI response with detected recommendations
+    3. Appends status as a trailing system message after the static prompt and history
+    4. Serves repeated opening turns from an in-process exact-match cache
+    5. Uses OpenAI function calling to detect module recommendations
+    6. Returns AI response with detected recommendations
 
     Args:
-        messages: List of message dictionaries with 'role' and 'content' keys
+        messages: List of message dictionaries with 'role' and 'content' keys.
+            The list is modified in place to become the full prompt; pass a
+            copy if the caller still needs the original history.
         conversation_id: Database ID of conversation
         db_session: SQLAlchemy session for database access
         model: OpenAI model to use
@@ -448,162 +685,153 @@ def get_ai_response(
         - function_calls: Raw function call data (for debugging)
     """
     try:
-        # Auto-detect language from the most recent user message if not specified
-        if language is None:
-            # Find the most recent user message
-            for msg in reversed(messages):
-                if msg.get("role") == "user":
-                    language = detect_language(msg.get("content", ""))
-                    logger.info(f"Auto-detected language: {language}")
-                    break
-            # If no user message found, default to Chinese
-            if language is None:
-                language = "chinese"
-                logger.info("No user message found, defaulting to Chinese")
-        # Import here to avoid circular dependency
-        from src.database.models import Conversation
-
-        # Step 1: Load conversation and module status
-        conversation = db_session.query(Conversation).filter(
-            Conversation.id == conversation_id
-        ).first()
-
-        if not conversation:
-            raise ValueError(f"Conversation {conversation_id} not found")
-
-        # Get module status from conversation metadata
-        module_status = {}
-        if conversation.extra_data and isinstance(conversation.extra_data, dict):
-            module_status = conversation.extra_data.get("module_status", {})
-
-        logger.info(f"Loaded module status for conversation {conversation_id}: {module_status}")
-
-        # Log module completion summary
-        completed_count = sum(1 for status in module_status.values() if status.get("completed_at"))
-        recommended_count = sum(1 for status in module_status.values() if status.get("recommended_at") and not status.get("completed_at"))
-        logger.info(f"Module summary: {completed_count} completed, {recommended_count} recommended but not completed")
-
-        # Step 2: Build dynamic system prompt with module status
-        base_prompt = get_base_system_prompt(language)
-        status_section = format_module_status(module_status, language)
-        full_system_prompt = base_prompt + status_section
-
-        logger.info(f"Injected module status into system prompt (prompt length: {len(full_system_prompt)} chars)")
-
-        # Insert/replace system prompt in messages
-        if not messages or messages[0].get("role") != "system":
-            messages = [{"role": "system", "content": full_system_prompt}] + messages
-        else:
-            messages[0] = {"role": "system", "content": full_system_prompt}
+        language = _resolve_language(messages, language)
+        # The module status load queries the DB, so it runs in a worker thread
+        messages, module_status = await asyncio.to_thread(
+            _prepare_prompt, messages, conversation_id, db_session, language
+        )
 
-        # Step 3: Call OpenAI with function calling
+        # Step 3: Serve opening turns from the exact-match cache when possible.
+        # Only conversations with no prior history are cached; the key covers the
+        # whole prompt (including module status) so personalised turns never collide.
+        params = _completion_params()
+        cache_key = None
+        if AI_RESPONSE_CACHE_ENABLED and sum(1 for m in messages if m.get("role") != "system") == 1:
+            cache_key = _response_cache_key(model, messages, params)
+            cached = _response_cache.get(cache_key)
+            if cached is not None:
+                logger.info("✓ Returning cached response for opening turn")
+                return copy.deepcopy(cached)
+
+        # Step 4: Call OpenAI with function calling
         logger.info(f"Calling OpenAI with {len(messages)} messages and function calling enabled")
 
-        response = client.chat.completions.create(
-            model=model,
-            messages=messages,
-            tools=get_openai_tools(),
-            tool_choice="auto",  # Let AI decide when to call functions
-            temperature=AI_TEMPERATURE,
-            max_tokens=AI_MAX_TOKENS,
-            presence_penalty=AI_PRESENCE_PENALTY,
-            frequency_penalty=AI_FREQUENCY_PENALTY
-        )
+        async with _AI_CONCURRENCY:
+            response = await _create_chat_completion({
+                "model": model,
+                "messages": messages,
+                "tools": get_openai_tools(),
+                "tool_choice": "auto",  # Let AI decide when to call functions
+                **params
+            })
 
         message = response.choices[0].message
         ai_content = message.content or ""
 
-        # Step 4: Extract function calls (module recommendations)
-        recommended_modules = []
-        function_calls = []
-
-        if message.tool_calls:
-            logger.info(f"✓ AI made {len(message.tool_calls)} function call(s)")
-
-            for tool_call in message.tool_calls:
-                logger.info(f"  Function: {tool_call.function.name}")
-                logger.info(f"  Arguments: {tool_call.function.arguments}")
-
-                if tool_call.function.name == "recommend_module":
-                    import json
-                    args = json.loads(tool_call.function.arguments)
-                    module_id = args.get("module_id")
-                    reasoning = args.get("reasoning", "")
-
-                    logger.info(f"  → Module recommendation: {module_id}")
-                    logger.info(f"  → Reasoning: {reasoning}")
-
-                    # Get module config
-                    from src.modules.module_config import get_module_by_id
-                    module_config = get_module_by_id(module_id)
-
-                    if module_config:
-                        module_rec = {
-                            "module_id": module_id,
-                            "name": module_config.get("name_zh" if language == "chinese" else "name_en"),
-                            "icon": module_config.get("icon"),
-                            "description": module_config.get("description_zh" if language == "chinese" else "description_en"),
-                            "reasoning": reasoning,
-                            "priority": module_config.get("priority")
-                        }
-                        recommended_modules.append(module_rec)
-                        logger.info(f"  → Built recommendation object: {module_rec['name']} ({module_rec['icon']})")
-                    else:
-                        logger.warning(f"  → Module config not found for: {module_id}")
-
-                    function_calls.append({
-                        "function": "recommend_module",
-                        "arguments": args
-                    })
-        else:
-            logger.info("✗ No function calls detected in AI response")
-
-        # Step 5: Fallback detection - Check if AI mentioned modules without calling function
-        # This ensures recommendations are never missed even if AI doesn't call the function
-        detected_modules = _detect_module_mentions(ai_content, module_status, language)
-
-        if detected_modules:
-            logger.warning(f"⚠️  Fallback detection found {len(detected_modules)} module mention(s) without function call:")
-            for module_id in detected_modules:
-                # Check if already in recommended_modules (from function call)
-                if not any(m["module_id"] == module_id for m in recommended_modules):
-                    logger.warning(f"  → Adding missed recommendation: {module_id}")
-
-                    # Get module config and add to recommendations
-                    from src.modules.module_config import get_module_by_id
-                    module_config = get_module_by_id(module_id)
-
-                    if module_config:
-                        module_rec = {
-                            "module_id": module_id,
-                            "name": module_config.get("name_zh" if language == "chinese" else "name_en"),
-                            "icon": module_config.get("icon"),
-                            "description": module_config.get("description_zh" if language == "chinese" else "description_en"),
-                            "reasoning": "Fallback detection - AI mentioned module without calling function",
-                            "priority": module_config.get("priority")
-                        }
-                        recommended_modules.append(module_rec)
-                        logger.warning(f"  → Added: {module_rec['name']} ({module_rec['icon']})")
-
-        if recommended_modules:
-            logger.info(f"✓ Returning response with {len(recommended_modules)} module recommendation(s):")
-            for mod in recommended_modules:
-                logger.info(f"  - {mod['name']} ({mod['module_id']})")
-        else:
-            logger.info("✓ Returning response with no module recommendations")
+        # Step 5: Extract function calls (module recommendations) with fallback detection
+        tool_calls = [
+            (tool_call.function.name, tool_call.function.arguments)
+            for tool_call in message.tool_calls or []
+        ]
+        recommended_modules, function_calls = await asyncio.to_thread(
+            _extract_recommendations, ai_content, tool_calls, module_status, language
+        )
 
-        return {
+        result = {
             "content": ai_content,
             "recommended_modules": recommended_modules,
             "function_calls": function_calls
         }
+        if cache_key is not None:
+            _response_cache.set(cache_key, copy.deepcopy(result))
+        return result
 
     except Exception as e:
         logger.error(f"Error getting AI response: {str(e)}")
-        raise Exception(f"Error getting AI response: {str(e)}")
+        raise _as_ai_error(e, "Error getting AI response") from e
+
+
+async def get_ai_response_stream(
+    messages: List[Dict[str, str]],
+    conversation_id: int,
+    db_session: Session,
+    model: str = "gpt-4",
+    language: Optional[str] = None
+) -> AsyncGenerator[Dict, None]:
+    """
+    Stream a response from OpenAI API, yielding text as it is generated
 
+    Same prompt and module recommendation logic as get_ai_response, but the
+    completion is requested with stream=True so the first tokens reach the
+    client immediately. Recommendations depend on the full reply and the
+    function-call arguments, so they are resolved once the stream finishes.
 
-def get_ai_response_with_image(
+    Args:
+        messages: List of message dictionaries with 'role' and 'content' keys.
+            The list is modified in place to become the full prompt; pass a
+            copy if the caller still needs the original history.
+        conversation_id: Database ID of conversation
+        db_session: SQLAlchemy session for database access
+        model: OpenAI model to use
+        language: Target language ('chinese' or 'english'). If None, auto-detects from messages.
+
+    Yields:
+        {"type": "delta", "content": <text>} for each content fragment, then one
+        {"type": "done", "content", "recommended_modules", "function_calls"} event
+    """
+    try:
+        language = _resolve_language(messages, language)
+        messages, module_status = await asyncio.to_thread(
+            _prepare_prompt, messages, conversation_id, db_session, language
+        )
+
+        logger.info(f"Streaming OpenAI response with {len(messages)} messages and function calling enabled")
+
+        content_parts = []
+        # Tool call names/arguments arrive as fragments keyed by tool call index
+        tool_call_parts: Dict[int, List] = {}
+
+        # The slot is held until the stream is drained
+        async with _AI_CONCURRENCY:
+            stream = await _create_chat_completion({
+                "model": model,
+                "messages": messages,
+                "tools": get_openai_tools(),
+                "tool_choice": "auto",
+                **_completion_params()
+            }, stream=True)
+
+            # Closing the stream releases the upstream HTTP/2 stream and its pooled
+            # connection even if the consumer stops early (client disconnect)
+            async with stream:
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta
+
+                    if delta.content:
+                        content_parts.append(delta.content)
+                        yield {"type": "delta", "content": delta.content}
+
+                    for tool_call in delta.tool_calls or []:
+                        parts = tool_call_parts.setdefault(tool_call.index, ["", []])
+                        if tool_call.function and tool_call.function.name:
+                            parts[0] += tool_call.function.name
+                        if tool_call.function and tool_call.function.arguments:
+                            parts[1].append(tool_call.function.arguments)
+
+        ai_content = "".join(content_parts)
+        tool_calls = [
+            (name, "".join(arguments))
+            for _, (name, arguments) in sorted(tool_call_parts.items())
+        ]
+        recommended_modules, function_calls = await asyncio.to_thread(
+            _extract_recommendations, ai_content, tool_calls, module_status, language
+        )
+
+        yield {
+            "type": "done",
+            "content": ai_content,
+            "recommended_modules": recommended_modules,
+            "function_calls": function_calls
+        }
+
+    except Exception as e:
+        logger.error(f"Error streaming AI response: {str(e)}")
+        raise _as_ai_error(e, "Error streaming AI response") from e
+
+
+async def get_ai_response_with_image(
     prompt: str,
     image_data: str,
     model: str = "gpt-4o",
@@ -632,27 +860,33 @@ def get_ai_response_with_image(
         else:
             full_prompt = prompt
 
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": full_prompt},
-                        {
-                            "type": "image_url",
-                            "image_url": {"url": f"data:image/jpeg;base64,{image_data}"}
-                        }
-                    ]
-                }
-            ],
-            max_tokens=AI_MAX_TOKENS
-        )
+        async with _AI_CONCURRENCY:
+            response = await client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {
+                        "role": "user",
+                        "content": [
+                            {"type": "text", "text": full_prompt},
+                            {
+                                "type": "image_url",
+                                "image_url": {"url": f"data:image/jpeg;base64,{image_data}"}
+                            }
+                        ]
+                    }
+                ],
+                max_tokens=AI_MAX_TOKENS
+            )
         return response.choices[0].message.content
     except Exception as e:
         logger.error(f"Error getting AI response with image: {str(e)}")
-        raise Exception(f"Error getting AI response with image: {str(e)}")
+        raise _as_ai_error(e, "Error getting AI response with image") from e
+
+
+async def close_ai_client():
+    """Close the shared OpenAI HTTP client (called on application shutdown)"""
+    await client.close()
 
 
 def build_message_history(db_messages) -> List[Dict[str, str]]:
@@ -660,9 +894,15 @@ def build_message_history(db_messages) -> List[Dict[str, str]]:
     Build message history for OpenAI API from database messages
 
     Args:
-        db_messages: List of Message objects from database
+        db_messages: Either (role, content) rows from a
+            ``with_entities(Message.role, Message.content)`` query, or
+            Message objects from database
 
     Returns:
         List of message dictionaries
     """
+    if not db_messages:
+        return []
+    if isinstance(db_messages[0], (tuple, Row)):
+        return [{"role": role, "content": content} for role, content in db_messages]
     return [{"role": msg.role, "content": msg.content} for msg in db_messages]
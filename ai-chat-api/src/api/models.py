@@ -1,17 +1,32 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 
 
+# Shared by the models built from ORM rows; validators/serializers are built
+# on first use instead of at import
+ORM_MODEL_CONFIG = ConfigDict(from_attributes=True, defer_build=True)
+
+
 class MessageResponse(BaseModel):
     id: int
     role: str
     content: str
     created_at: datetime
-    extra_data: Optional[Dict[str, Any]] = {}
+    extra_data: Dict[str, Any] = Field(default_factory=dict)
 
-    class Config:
-        from_attributes = True
+    model_config = ORM_MODEL_CONFIG
+
+    @classmethod
+    def from_orm_fast(cls, message) -> "MessageResponse":
+        """Build from a trusted Message row without re-validating DB-typed fields"""
+        return cls.model_construct(
+            id=message.id,
+            role=message.role,
+            content=message.content,
+            created_at=message.created_at,
+            extra_data=message.extra_data or {}
+        )
 
 
 class ConversationCreate(BaseModel):
@@ -25,11 +40,23 @@ class ConversationResponse(BaseModel):
     user_id: Optional[str] = None
     created_at: datetime
     updated_at: datetime
-    extra_data: Optional[Dict[str, Any]] = {}
-    messages: List[MessageResponse] = []
+    extra_data: Dict[str, Any] = Field(default_factory=dict)
+    messages: List[MessageResponse] = Field(default_factory=list)
+
+    model_config = ORM_MODEL_CONFIG
 
-    class Config:
-        from_attributes = True
+    @classmethod
+    def from_orm_fast(cls, conversation) -> "ConversationResponse":
+        """Build from a trusted Conversation row (and its messages) without re-validation"""
+        return cls.model_construct(
+            id=conversation.id,
+            session_id=conversation.session_id,
+            user_id=conversation.user_id,
+            created_at=conversation.created_at,
+            updated_at=conversation.updated_at,
+            extra_data=conversation.extra_data or {},
+            messages=[MessageResponse.from_orm_fast(m) for m in conversation.messages]
+        )
 
 
 class ChatRequest(BaseModel):
@@ -64,5 +91,5 @@ class ChatResponse(BaseModel):
     conversation_id: int
     user_message: MessageResponse
     assistant_message: MessageResponse
-    recommended_modules: Optional[List[ModuleRecommendation]] = []
-    module_status: Optional[Dict[str, Any]] = {}
+    recommended_modules: List[ModuleRecommendation] = Field(default_factory=list)
+    module_status: Dict[str, Any] = Field(default_factory=dict)
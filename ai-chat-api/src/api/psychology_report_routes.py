@@ -5,19 +5,26 @@ Provides endpoints for generating psychology reports, checking status,
 and generating specific analysis texts.
 """
 
+import asyncio
 import logging
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from datetime import datetime
-
-from src.database.database import get_db
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.orm import Session, load_only
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime, timezone
+
+from src.config.settings import (
+    ANALYSIS_CACHE_TTL, ANALYSIS_CACHE_MAXSIZE, REPORT_WORKER_COUNT, REPORT_EVENTS_MAX_DURATION
+)
+from src.database.database import get_db, SessionLocal
 from src.database.psychology_models import PsychologyAssessment, PsychologyReport
 from src.services.psychology.dominant_elements import identify_all_dominant_elements
 from src.services.psychology.analysis_generator import generate_all_analysis_texts
 from src.services.psychology.personality_classifier import classify_and_save_personality
 from src.services.psychology.report_assembler import assemble_report_data
+from src.services.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +49,10 @@ class ReportGenerationResponse(BaseModel):
 
 
 class ReportStatusResponse(BaseModel):
+    # Only documents the /status schema (the route returns a plain dict), so
+    # the validator is not built unless something actually validates one
+    model_config = ConfigDict(defer_build=True)
+
     ok: bool
     report_id: int
     status: str
@@ -67,21 +78,88 @@ class AnalysisItem(BaseModel):
 
 
 class AnalysisGenerationResponse(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     ok: bool
     analyses: List[AnalysisItem]
     error: Optional[str] = None
 
 
+# Assessment columns read by the report / analysis paths; the rest of the row
+# (large JSON profiles) is left unloaded
+_ASSESSMENT_REPORT_COLUMNS = (
+    PsychologyAssessment.id,
+    PsychologyAssessment.user_id,
+    PsychologyAssessment.emotional_regulation_score,
+    PsychologyAssessment.cognitive_flexibility_score,
+    PsychologyAssessment.relationship_sensitivity_score,
+    PsychologyAssessment.internal_conflict_score,
+    PsychologyAssessment.growth_potential_score,
+    PsychologyAssessment.created_at,
+    PsychologyAssessment.updated_at
+)
+
+
+# Dominant elements + analysis texts per assessment, shared by report generation
+# and the analysis endpoint so the LLM work is not repeated between them.
+# The cache is per process: with several app workers each one may still
+# generate the texts once.
+_analysis_cache = TTLCache(maxsize=ANALYSIS_CACHE_MAXSIZE, ttl=ANALYSIS_CACHE_TTL)
+
+
+def _analysis_cache_key(assessment: PsychologyAssessment, language: str) -> tuple:
+    """Cache key that changes whenever the assessment row is updated"""
+    updated_at = assessment.updated_at or assessment.created_at
+    return (assessment.id, language, updated_at.timestamp() if updated_at else None)
+
+
+def get_dominant_elements_and_analysis(
+    assessment: PsychologyAssessment,
+    db_session: Session,
+    language: str
+) -> tuple:
+    """
+    Identify dominant elements and generate analysis texts, reusing earlier results.
+
+    identify_all_dominant_elements writes the dominant elements back to the
+    assessment, which bumps updated_at; the result is stored under the
+    post-update key so the next request for the unchanged assessment hits.
+
+    Returns:
+        (dominant_elements, analysis_texts)
+    """
+    cached = _analysis_cache.get(_analysis_cache_key(assessment, language))
+    if cached is not None:
+        logger.info(f"Reusing cached dominant elements and analysis for assessment {assessment.id}")
+        return cached
+
+    dominant_elements = identify_all_dominant_elements(assessment.id, db_session)
+    analysis_texts = generate_all_analysis_texts(
+        user_id=assessment.user_id,
+        assessment_id=assessment.id,
+        dominant_elements=dominant_elements,
+        db_session=db_session,
+        language=language
+    )
+
+    db_session.refresh(assessment, ['updated_at'])
+    result = (dominant_elements, analysis_texts)
+    _analysis_cache.set(_analysis_cache_key(assessment, language), result)
+    return result
+
+
 def generate_report_background(
     report_id: int,
     assessment_id: int,
     user_id: str,
-    language: str,
-    db_session: Session
+    language: str
 ):
     """
     Background task for report generation.
 
+    Opens and closes its own database session; it runs after the request that
+    queued it has finished, so it must not reuse a request-scoped session.
+
     Steps:
     1. Identify dominant elements
     2. Generate analysis texts
@@ -89,29 +167,24 @@ def generate_report_background(
     4. Assemble report data
     5. Update report status
     """
+    db_session = SessionLocal()
     try:
         logger.info(f"Starting background report generation for report_id={report_id}")
 
         # Get assessment
-        assessment = db_session.query(PsychologyAssessment).filter(
+        assessment = db_session.query(PsychologyAssessment).options(
+            load_only(*_ASSESSMENT_REPORT_COLUMNS)
+        ).filter(
             PsychologyAssessment.id == assessment_id
         ).first()
 
         if not assessment:
             raise ValueError(f"Assessment {assessment_id} not found")
 
-        # Step 1: Identify dominant elements
-        logger.info("Step 1: Identifying dominant elements")
-        dominant_elements = identify_all_dominant_elements(assessment_id, db_session)
-
-        # Step 2: Generate analysis texts
-        logger.info("Step 2: Generating AI analysis texts")
-        analysis_texts = generate_all_analysis_texts(
-            user_id=user_id,
-            assessment_id=assessment_id,
-            dominant_elements=dominant_elements,
-            db_session=db_session,
-            language=language
+        # Steps 1-2: Identify dominant elements and generate analysis texts
+        logger.info("Steps 1-2: Identifying dominant elements and generating AI analysis texts")
+        dominant_elements, analysis_texts = get_dominant_elements_and_analysis(
+            assessment, db_session, language
         )
 
         # Step 3: Classify personality style
@@ -149,7 +222,8 @@ def generate_report_background(
         if report:
             report.report_data = report_data
             report.generation_status = 'completed'
-            report.generated_at = datetime.utcnow()
+            # Naive UTC, like every other timestamp column
+            report.generated_at = datetime.now(timezone.utc).replace(tzinfo=None)
             db_session.commit()
 
             logger.info(f"Report {report_id} generation completed successfully")
@@ -159,26 +233,155 @@ def generate_report_background(
     except Exception as e:
         logger.error(f"Error in background report generation: {e}", exc_info=True)
 
-        # Update report status to failed
+        # Discard the failed work, then record the failure in its own transaction
+        db_session.rollback()
         try:
-            report = db_session.query(PsychologyReport).filter(
-                PsychologyReport.id == report_id
-            ).first()
-
-            if report:
-                report.generation_status = 'failed'
-                report.error_message = str(e)
-                db_session.commit()
+            with db_session.begin():
+                report = db_session.query(PsychologyReport).filter(
+                    PsychologyReport.id == report_id
+                ).first()
+
+                if report:
+                    report.generation_status = 'failed'
+                    report.error_message = str(e)
         except Exception as update_error:
             logger.error(f"Failed to update report status to failed: {update_error}")
 
-        db_session.rollback()
+    finally:
+        db_session.close()
+
+
+# Report generation queue, consumed by REPORT_WORKER_COUNT long-lived worker
+# tasks for the lifetime of the app (see start_report_worker / stop_report_worker)
+_report_queue: Optional[asyncio.Queue] = None
+_report_worker_tasks: List[asyncio.Task] = []
+
+
+async def _report_worker():
+    """Consume queued report jobs, running each pipeline in a worker thread"""
+    while True:
+        job = await _report_queue.get()
+        try:
+            await asyncio.to_thread(generate_report_background, **job)
+        except Exception as e:
+            logger.error(f"Report worker failed on job {job}: {e}", exc_info=True)
+        finally:
+            _report_queue.task_done()
+
+
+def _fail_reports(report_ids: List[int], error_message: str):
+    """Mark reports that will not be generated as failed so they don't stay pending"""
+    db_session = SessionLocal()
+    try:
+        db_session.query(PsychologyReport).filter(
+            PsychologyReport.id.in_(report_ids),
+            PsychologyReport.generation_status == 'pending'
+        ).update({
+            PsychologyReport.generation_status: 'failed',
+            PsychologyReport.error_message: error_message
+        }, synchronize_session=False)
+        db_session.commit()
+    finally:
+        db_session.close()
+
+
+def start_report_worker():
+    """Create the report queue and start its workers (call on app startup)"""
+    global _report_queue, _report_worker_tasks
+    if any(not task.done() for task in _report_worker_tasks):
+        return
+    _report_queue = asyncio.Queue()
+    _report_worker_tasks = [
+        asyncio.create_task(_report_worker())
+        for _ in range(max(1, REPORT_WORKER_COUNT))
+    ]
+    logger.info(f"Report generation workers started ({len(_report_worker_tasks)})")
+
+
+async def stop_report_worker():
+    """
+    Stop the report workers (call on app shutdown)
+
+    Reports still waiting in the queue are marked failed rather than left
+    pending, since the in-memory queue does not survive the restart.
+    """
+    global _report_worker_tasks
+    if not _report_worker_tasks:
+        return
+    for task in _report_worker_tasks:
+        task.cancel()
+    await asyncio.gather(*_report_worker_tasks, return_exceptions=True)
+    _report_worker_tasks = []
+
+    unprocessed = []
+    while not _report_queue.empty():
+        unprocessed.append(_report_queue.get_nowait()["report_id"])
+        _report_queue.task_done()
+    if unprocessed:
+        try:
+            await asyncio.to_thread(
+                _fail_reports, unprocessed, "Report generation was interrupted by a server shutdown"
+            )
+            logger.warning(f"Marked {len(unprocessed)} queued report(s) as failed on shutdown")
+        except Exception as e:
+            logger.error(f"Failed to mark queued reports {unprocessed} as failed: {e}")
+    logger.info("Report generation workers stopped")
+
+
+async def enqueue_report_job(report_id: int, assessment_id: int, user_id: str, language: str):
+    """Queue a report for generation by the background worker"""
+    if _report_queue is None or not _report_worker_tasks:
+        raise RuntimeError("Report generation worker is not running")
+    await _report_queue.put({
+        "report_id": report_id,
+        "assessment_id": assessment_id,
+        "user_id": user_id,
+        "language": language
+    })
+
+
+def _create_pending_report(request: ReportGenerationRequest, db: Session) -> PsychologyReport:
+    """
+    Validate the assessment and insert a pending psychology_reports row.
+
+    Raises:
+        ValueError: If the assessment is missing or less than 70% complete
+    """
+    # Validate assessment exists
+    assessment = db.query(
+        PsychologyAssessment.user_id,
+        PsychologyAssessment.completion_percentage
+    ).filter(
+        PsychologyAssessment.id == request.assessment_id
+    ).first()
+
+    if not assessment:
+        raise ValueError(f"Assessment {request.assessment_id} not found")
+
+    # Check assessment completeness (>= 70%)
+    completion_percentage = assessment.completion_percentage or 0
+    if completion_percentage < 70:
+        raise ValueError(f"Assessment must be at least 70% complete (current: {completion_percentage}%)")
+
+    # Create psychology_reports record with status "pending"
+    report = PsychologyReport(
+        user_id=assessment.user_id,
+        assessment_id=request.assessment_id,
+        report_type='comprehensive',
+        language=request.language,
+        format=request.format,
+        report_data={},  # Will be filled by background task
+        generation_status='pending'
+    )
+    db.add(report)
+    db.commit()
+    db.refresh(report)
+    return report
 
 
 @router.post("/report/generate", response_model=ReportGenerationResponse)
 async def generate_report(
     request: ReportGenerationRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -190,52 +393,30 @@ async def generate_report(
     try:
         logger.info(f"Received report generation request for assessment {request.assessment_id}")
 
-        # Validate assessment exists
-        assessment = db.query(PsychologyAssessment).filter(
-            PsychologyAssessment.id == request.assessment_id
-        ).first()
-
-        if not assessment:
-            return ReportGenerationResponse(
-                ok=False,
-                status='error',
-                error=f"Assessment {request.assessment_id} not found"
-            )
-
-        # Check assessment completeness (>= 70%)
-        completion_percentage = assessment.completion_percentage or 0
-        if completion_percentage < 70:
+        # Blocking DB work runs off the event loop
+        try:
+            report = await asyncio.to_thread(_create_pending_report, request, db)
+        except ValueError as e:
             return ReportGenerationResponse(
                 ok=False,
                 status='error',
-                error=f"Assessment must be at least 70% complete (current: {completion_percentage}%)"
+                error=str(e)
             )
 
-        # Create psychology_reports record with status "pending"
-        report = PsychologyReport(
-            user_id=assessment.user_id,
-            assessment_id=request.assessment_id,
-            report_type='comprehensive',
-            language=request.language,
-            format=request.format,
-            report_data={},  # Will be filled by background task
-            generation_status='pending'
-        )
-        db.add(report)
-        db.commit()
-        db.refresh(report)
-
         logger.info(f"Created report record with id={report.id}")
 
-        # Trigger async report generation
-        background_tasks.add_task(
-            generate_report_background,
-            report_id=report.id,
-            assessment_id=request.assessment_id,
-            user_id=assessment.user_id,
-            language=request.language,
-            db_session=db
-        )
+        # Hand off to the persistent report worker (ids only, no session)
+        try:
+            await enqueue_report_job(
+                report_id=report.id,
+                assessment_id=request.assessment_id,
+                user_id=report.user_id,
+                language=request.language
+            )
+        except Exception as e:
+            # The row is already committed; don't leave it pending forever
+            await asyncio.to_thread(_fail_reports, [report.id], str(e))
+            raise
 
         return ReportGenerationResponse(
             ok=True,
@@ -253,8 +434,50 @@ async def generate_report(
         )
 
 
+# Progress (0-100) and estimated seconds remaining for each generation status
+REPORT_PROGRESS = {
+    'pending': 10,
+    'processing': 50,
+    'completed': 100,
+    'failed': 0
+}
+REPORT_TIME_REMAINING = {
+    'pending': 30,
+    'processing': 15
+}
+
+# Seconds between status checks in the report events stream
+REPORT_EVENTS_POLL_INTERVAL = 1.0
+
+
+def _fetch_report_status(db: Session, report_id: int) -> Optional[str]:
+    """Return the report's generation_status (served from ix_reports_id_status), or None if missing"""
+    row = db.query(PsychologyReport.generation_status).filter(
+        PsychologyReport.id == report_id
+    ).first()
+    return row.generation_status if row else None
+
+
+def _fetch_report_column(db: Session, report_id: int, column):
+    """Load a single (possibly large) column of a report only when it is needed"""
+    return db.query(column).filter(PsychologyReport.id == report_id).scalar()
+
+
+def _report_status_response(report_id: int, status: str, ok: bool = True, **fields) -> ORJSONResponse:
+    """
+    Build a ReportStatusResponse body as a plain dict.
+
+    Skips pydantic validation of report_data (a large blob that was already
+    validated when it was stored); response_model on the route still
+    documents the schema.
+    """
+    content = dict.fromkeys(ReportStatusResponse.model_fields)
+    content.update(ok=ok, report_id=report_id, status=status, **fields)
+    return ORJSONResponse(content=content)
+
+
 @router.get("/report/{report_id}/status", response_model=ReportStatusResponse)
-async def get_report_status(
+def get_report_status(
     report_id: int,
     db: Session = Depends(get_db)
 ):
@@ -266,66 +489,130 @@ async def get_report_status(
     try:
         logger.info(f"Checking status for report {report_id}")
 
-        # Query psychology_reports table
-        report = db.query(PsychologyReport).filter(
-            PsychologyReport.id == report_id
-        ).first()
+        status = _fetch_report_status(db, report_id)
 
-        if not report:
-            return ReportStatusResponse(
+        if status is None:
+            return _report_status_response(
+                report_id,
+                'not_found',
                 ok=False,
-                report_id=report_id,
-                status='not_found',
                 error=f"Report {report_id} not found"
             )
 
-        # Calculate progress based on status
-        progress_map = {
-            'pending': 10,
-            'processing': 50,
-            'completed': 100,
-            'failed': 0
+        fields = {
+            'progress': REPORT_PROGRESS.get(status, 0),
+            'current_step': status,
+            'estimated_time_remaining': REPORT_TIME_REMAINING.get(status)
         }
-        progress = progress_map.get(report.generation_status, 0)
-
-        # Estimate time remaining
-        estimated_time_remaining = None
-        if report.generation_status == 'pending':
-            estimated_time_remaining = 30
-        elif report.generation_status == 'processing':
-            estimated_time_remaining = 15
-
-        response = ReportStatusResponse(
-            ok=True,
-            report_id=report_id,
-            status=report.generation_status,
-            progress=progress,
-            current_step=report.generation_status,
-            estimated_time_remaining=estimated_time_remaining
-        )
 
         # Include report data if completed
-        if report.generation_status == 'completed':
-            response.report_data = report.report_data
+        if status == 'completed':
+            fields['report_data'] = _fetch_report_column(db, report_id, PsychologyReport.report_data)
 
         # Include error message if failed
-        if report.generation_status == 'failed':
-            response.error = report.error_message
+        if status == 'failed':
+            fields['error'] = _fetch_report_column(db, report_id, PsychologyReport.error_message)
 
-        return response
+        return _report_status_response(report_id, status, **fields)
 
     except Exception as e:
         logger.error(f"Error in get_report_status: {e}", exc_info=True)
-        return ReportStatusResponse(
-            ok=False,
-            report_id=report_id,
-            status='error',
-            error=str(e)
-        )
+        return _report_status_response(report_id, 'error', ok=False, error=str(e))
+
+
+def _report_event(data: dict) -> str:
+    """Format a dict as a server-sent event"""
+    return f"data: {orjson.dumps(data, default=str).decode()}\n\n"
+
+
+@router.get("/report/{report_id}/events")
+async def get_report_events(report_id: int, request: Request):
+    """
+    Stream report generation status as server-sent events.
+
+    Replaces repeated status polling: emits an event (same fields as
+    ReportStatusResponse) whenever the status changes, and closes the stream
+    once the report is completed, failed or not found. The stream also ends
+    when the client disconnects, or with a 'timeout' event after
+    REPORT_EVENTS_MAX_DURATION seconds (e.g. a report left pending).
+    """
+    # The session must outlive the request handler, so the stream owns it
+    db = SessionLocal()
+
+    async def event_stream():
+        last_status = None
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + REPORT_EVENTS_MAX_DURATION
+        try:
+            while True:
+                if await request.is_disconnected():
+                    return
+
+                if loop.time() >= deadline:
+                    yield _report_event({
+                        'ok': False,
+                        'report_id': report_id,
+                        'status': 'timeout',
+                        'current_step': last_status,
+                        'error': f"Report {report_id} did not finish within {REPORT_EVENTS_MAX_DURATION}s"
+                    })
+                    return
+
+                status = await asyncio.to_thread(_fetch_report_status, db, report_id)
+
+                if status is None:
+                    yield _report_event({
+                        'ok': False,
+                        'report_id': report_id,
+                        'status': 'not_found',
+                        'error': f"Report {report_id} not found"
+                    })
+                    return
+
+                if status != last_status:
+                    last_status = status
+                    event = {
+                        'ok': True,
+                        'report_id': report_id,
+                        'status': status,
+                        'progress': REPORT_PROGRESS.get(status, 0),
+                        'current_step': status,
+                        'estimated_time_remaining': REPORT_TIME_REMAINING.get(status)
+                    }
+                    if status == 'completed':
+                        event['report_data'] = await asyncio.to_thread(
+                            _fetch_report_column, db, report_id, PsychologyReport.report_data
+                        )
+                    elif status == 'failed':
+                        event['error'] = await asyncio.to_thread(
+                            _fetch_report_column, db, report_id, PsychologyReport.error_message
+                        )
+                    yield _report_event(event)
+
+                    if status in ('completed', 'failed'):
+                        return
+
+                # End the read transaction so the pooled connection is released
+                # between checks and the next one sees newly committed updates
+                await asyncio.to_thread(db.rollback)
+                await asyncio.sleep(REPORT_EVENTS_POLL_INTERVAL)
+
+        except Exception as e:
+            logger.error(f"Error in report events stream: {e}", exc_info=True)
+            yield _report_event({
+                'ok': False,
+                'report_id': report_id,
+                'status': 'error',
+                'error': str(e)
+            })
+        finally:
+            db.close()
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
 
 
 @router.post("/analysis/generate", response_model=AnalysisGenerationResponse)
-async def generate_analysis_texts(
+def generate_analysis_texts(
     request: AnalysisGenerationRequest,
     db: Session = Depends(get_db)
 ):
@@ -338,7 +625,9 @@ async def generate_analysis_texts(
         logger.info(f"Received analysis generation request for assessment {request.assessment_id}")
 
         # Validate assessment exists
-        assessment = db.query(PsychologyAssessment).filter(
+        assessment = db.query(PsychologyAssessment).options(
+            load_only(*_ASSESSMENT_REPORT_COLUMNS)
+        ).filter(
             PsychologyAssessment.id == request.assessment_id
         ).first()
 
@@ -349,16 +638,9 @@ async def generate_analysis_texts(
                 error=f"Assessment {request.assessment_id} not found"
             )
 
-        # Identify dominant elements
-        dominant_elements = identify_all_dominant_elements(request.assessment_id, db)
-
-        # Generate requested analysis types
-        analysis_texts = generate_all_analysis_texts(
-            user_id=assessment.user_id,
-            assessment_id=request.assessment_id,
-            dominant_elements=dominant_elements,
-            db_session=db,
-            language=request.language
+        # Identify dominant elements and generate analysis texts
+        dominant_elements, analysis_texts = get_dominant_elements_and_analysis(
+            assessment, db, request.language
         )
 
         # Build response
@@ -1,118 +1,378 @@
 import os
-from dotenv import load_dotenv
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Optional, Tuple
 
-load_dotenv()
+
+def _load_env(path: Path) -> None:
+    """
+    Load KEY=VALUE lines from a .env file into os.environ.
+
+    Variables already set in the environment win. Supports blank and comment
+    lines, an optional `export` prefix, quoted values (taken verbatim up to
+    the closing quote, so `=` and `#` inside quotes are kept) and trailing
+    ` #` comments. Unlike python-dotenv's find_dotenv(), parent directories
+    are not searched.
+    """
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        if line.startswith("export "):
+            line = line[len("export "):]
+        key, _, value = line.partition("=")
+        value = value.strip()
+        closing = value.find(value[0], 1) if value[:1] in ("\"", "'") else -1
+        if closing != -1:
+            value = value[1:closing]
+        else:
+            value = value.split(" #", 1)[0].rstrip()
+        os.environ.setdefault(key.strip(), value)
+
+# Load ai-chat-api/.env directly (stdlib only; no python-dotenv import or
+# directory walk on every cold start)
+_load_env(Path(__file__).resolve().parents[2] / ".env")
+
+# Environment is read once at import; every setting goes through _get
+_ENV = os.environ
+_TRUE = frozenset({"true", "1", "yes"})
+
+def _bool(value: str) -> bool:
+    """Parse a boolean env value ("true"/"1"/"yes", case-insensitive)"""
+    return value.strip().lower() in _TRUE
+
+def _csv(value: str) -> Tuple[str, ...]:
+    """Parse a comma-separated env value, dropping blanks and surrounding spaces"""
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+def _get(name, default, cast=str):
+    """Return env var `name` converted with `cast`, or `default` if unset"""
+    value = _ENV.get(name)
+    return cast(value) if value is not None else default
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Typed, immutable snapshot of the environment configuration"""
+
+    # Database
+    database_url: str
+    db_pool_size: int  # Persistent connections per process (ignored for SQLite)
+    db_max_overflow: int  # Extra connections allowed under burst load
+    db_pool_timeout: int  # Seconds to wait for a free connection
+    db_pool_recycle: int  # Seconds before a pooled connection is replaced
+
+    # OpenAI
+    openai_api_key: Optional[str]
+
+    # API Settings
+    api_host: str
+    api_port: int
+
+    # CORS
+    cors_origins: Tuple[str, ...]
+
+    # Multi-Psychology Detection Settings
+    psychology_detection_enabled: bool
+
+    # Pattern Recognition Settings (NEW)
+    pattern_recognition_enabled: bool
+    pattern_llm_threshold: float  # Depth threshold for LLM analysis
+    pattern_min_messages: int  # Minimum messages for pattern detection
+    pattern_min_confidence: float  # Minimum confidence for pattern detection
+
+    # Emotional Progression Tracking Settings (NEW)
+    progression_tracking_enabled: bool
+    progression_state_limit: int  # Max emotional states to store
+    progression_min_states: int  # Min states for progression analysis
+
+    # Individual Indicator Settings (New 5-Indicator System)
+    emotional_awareness_enabled: bool
+    cognitive_patterns_enabled: bool
+    relational_patterns_enabled: bool
+    personality_types_enabled: bool
+    ifs_enabled: bool
+
+    # Indicator Analysis Intervals (analyze every N messages)
+    emotional_awareness_interval: int
+    cognitive_patterns_interval: int
+    relational_patterns_interval: int
+    personality_types_interval: int
+    ifs_interval: int
+
+    # Indicator Window Sizes (number of recent messages to analyze)
+    emotional_awareness_window: int
+    cognitive_patterns_window: int
+    relational_patterns_window: int
+    personality_types_window: int
+    ifs_window: int
+
+    # Indicator Confidence Thresholds
+    emotional_awareness_min_confidence: float
+    cognitive_patterns_min_confidence: float
+    relational_patterns_min_confidence: float
+    personality_types_min_confidence: float
+    ifs_min_confidence: float
+
+    # LLM Models for Analysis
+    psychology_llm_model: str
+
+    # AI Response Language Settings
+    ai_response_language: str  # Default to Chinese
+    ai_force_language: bool  # Force language regardless of input
+
+    # AI Response Control Settings
+    ai_temperature: float  # Creativity vs consistency (0.0-2.0)
+    ai_max_tokens: int  # Max response length (increased for better responses)
+    ai_presence_penalty: float  # Reduce repetition (0.0-2.0)
+    ai_frequency_penalty: float  # Encourage word diversity (0.0-2.0)
+    ai_max_retries: int  # Retries (with backoff) on rate limits, timeouts and 5xx
+    ai_context_window: int  # Model context size in tokens; older turns are trimmed to fit
+    ai_max_concurrent_requests: int  # In-flight OpenAI requests per worker
+
+    # AI Response Cache Settings (exact-match cache for opening turns)
+    ai_response_cache_enabled: bool
+    ai_response_cache_ttl: int  # Seconds before a cached response expires
+    ai_response_cache_maxsize: int  # Max cached responses
+
+    # Psychology Report Settings
+    report_worker_count: int  # Reports generated concurrently per process
+    analysis_cache_ttl: int  # Seconds dominant elements + analysis texts are reused
+    analysis_cache_maxsize: int  # Max cached assessments (per process)
+    report_events_max_duration: int  # Seconds before a report status stream is closed
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Build settings from the environment (read once at import)"""
+        return cls(
+            # Database
+            database_url=_get("DATABASE_URL", "sqlite:///./chat.db"),
+            db_pool_size=_get("DB_POOL_SIZE", 10, int),
+            db_max_overflow=_get("DB_MAX_OVERFLOW", 20, int),
+            db_pool_timeout=_get("DB_POOL_TIMEOUT", 30, int),
+            db_pool_recycle=_get("DB_POOL_RECYCLE", 1800, int),
+            # OpenAI
+            openai_api_key=_get("OPENAI_API_KEY", None),
+            # API Settings
+            api_host=_get("API_HOST", "0.0.0.0"),
+            api_port=_get("API_PORT", 8000, int),
+            # CORS
+            cors_origins=_get("CORS_ORIGINS", ("http://localhost:8080", "null"), _csv),
+            # Multi-Psychology Detection Settings
+            psychology_detection_enabled=_get("PSYCHOLOGY_DETECTION_ENABLED", True, _bool),
+            # Pattern Recognition Settings (NEW)
+            pattern_recognition_enabled=_get("PATTERN_RECOGNITION_ENABLED", True, _bool),
+            pattern_llm_threshold=_get("PATTERN_LLM_THRESHOLD", 0.5, float),
+            pattern_min_messages=_get("PATTERN_MIN_MESSAGES", 5, int),
+            pattern_min_confidence=_get("PATTERN_MIN_CONFIDENCE", 0.6, float),
+            # Emotional Progression Tracking Settings (NEW)
+            progression_tracking_enabled=_get("PROGRESSION_TRACKING_ENABLED", True, _bool),
+            progression_state_limit=_get("PROGRESSION_STATE_LIMIT", 20, int),
+            progression_min_states=_get("PROGRESSION_MIN_STATES", 2, int),
+            # Individual Indicator Settings (New 5-Indicator System)
+            emotional_awareness_enabled=_get("EMOTIONAL_AWARENESS_ENABLED", True, _bool),
+            cognitive_patterns_enabled=_get("COGNITIVE_PATTERNS_ENABLED", True, _bool),
+            relational_patterns_enabled=_get("RELATIONAL_PATTERNS_ENABLED", True, _bool),
+            personality_types_enabled=_get("PERSONALITY_TYPES_ENABLED", True, _bool),
+            ifs_enabled=_get("IFS_ENABLED", True, _bool),
+            # Indicator Analysis Intervals (analyze every N messages)
+            emotional_awareness_interval=_get("EMOTIONAL_AWARENESS_INTERVAL", 2, int),
+            cognitive_patterns_interval=_get("COGNITIVE_PATTERNS_INTERVAL", 2, int),
+            relational_patterns_interval=_get("RELATIONAL_PATTERNS_INTERVAL", 3, int),
+            personality_types_interval=_get("PERSONALITY_TYPES_INTERVAL", 3, int),
+            ifs_interval=_get("IFS_INTERVAL", 3, int),
+            # Indicator Window Sizes (number of recent messages to analyze)
+            emotional_awareness_window=_get("EMOTIONAL_AWARENESS_WINDOW", 10, int),
+            cognitive_patterns_window=_get("COGNITIVE_PATTERNS_WINDOW", 10, int),
+            relational_patterns_window=_get("RELATIONAL_PATTERNS_WINDOW", 10, int),
+            personality_types_window=_get("PERSONALITY_TYPES_WINDOW", 10, int),
+            ifs_window=_get("IFS_WINDOW", 10, int),
+            # Indicator Confidence Thresholds
+            emotional_awareness_min_confidence=_get("EMOTIONAL_AWARENESS_MIN_CONFIDENCE", 0.5, float),
+            cognitive_patterns_min_confidence=_get("COGNITIVE_PATTERNS_MIN_CONFIDENCE", 0.5, float),
+            relational_patterns_min_confidence=_get("RELATIONAL_PATTERNS_MIN_CONFIDENCE", 0.5, float),
+            personality_types_min_confidence=_get("PERSONALITY_TYPES_MIN_CONFIDENCE", 0.5, float),
+            ifs_min_confidence=_get("IFS_MIN_CONFIDENCE", 0.5, float),
+            # LLM Models for Analysis
+            psychology_llm_model=_get("PSYCHOLOGY_LLM_MODEL", "gpt-3.5-turbo"),
+            # AI Response Language Settings
+            ai_response_language=_get("AI_RESPONSE_LANGUAGE", "chinese"),
+            ai_force_language=_get("AI_FORCE_LANGUAGE", True, _bool),
+            # AI Response Control Settings
+            ai_temperature=_get("AI_TEMPERATURE", 0.7, float),
+            ai_max_tokens=_get("AI_MAX_TOKENS", 1500, int),
+            ai_presence_penalty=_get("AI_PRESENCE_PENALTY", 0.3, float),
+            ai_frequency_penalty=_get("AI_FREQUENCY_PENALTY", 0.3, float),
+            ai_max_retries=_get("AI_MAX_RETRIES", 2, int),
+            ai_context_window=_get("AI_CONTEXT_WINDOW", 8192, int),
+            ai_max_concurrent_requests=_get("AI_MAX_CONCURRENT_REQUESTS", 100, int),
+            # AI Response Cache Settings (exact-match cache for opening turns)
+            ai_response_cache_enabled=_get("AI_RESPONSE_CACHE_ENABLED", True, _bool),
+            ai_response_cache_ttl=_get("AI_RESPONSE_CACHE_TTL", 3600, int),
+            ai_response_cache_maxsize=_get("AI_RESPONSE_CACHE_MAXSIZE", 10000, int),
+            # Psychology Report Settings
+            report_worker_count=_get("REPORT_WORKER_COUNT", 4, int),
+            analysis_cache_ttl=_get("ANALYSIS_CACHE_TTL", 3600, int),
+            analysis_cache_maxsize=_get("ANALYSIS_CACHE_MAXSIZE", 1024, int),
+            report_events_max_duration=_get("REPORT_EVENTS_MAX_DURATION", 300, int)
+        )
+
+
+settings = Settings.from_env()
+
+# Module-level names kept so existing `from src.config.settings import X`
+# imports keep working
 
 # Database
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./chat.db")
+DATABASE_URL = settings.database_url
+DB_POOL_SIZE = settings.db_pool_size
+DB_MAX_OVERFLOW = settings.db_max_overflow
+DB_POOL_TIMEOUT = settings.db_pool_timeout
+DB_POOL_RECYCLE = settings.db_pool_recycle
+
+# Dialect flags, derived once from the URL scheme
+IS_POSTGRES = DATABASE_URL.startswith("postgresql")
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
 
 # OpenAI
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_API_KEY = settings.openai_api_key
 if not OPENAI_API_KEY or not OPENAI_API_KEY.startswith("sk-"):
     raise ValueError("OpenAI API key is not configured properly")
 
 # API Settings
-API_HOST = os.getenv("API_HOST", "0.0.0.0")
-API_PORT = int(os.getenv("API_PORT", "8000"))
+API_HOST = settings.api_host
+API_PORT = settings.api_port
 
 # CORS
-CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:8080,null").split(",")
+CORS_ORIGINS = settings.cors_origins
 
 # Multi-Psychology Detection Settings
-PSYCHOLOGY_DETECTION_ENABLED = os.getenv("PSYCHOLOGY_DETECTION_ENABLED", "true").lower() == "true"
+PSYCHOLOGY_DETECTION_ENABLED = settings.psychology_detection_enabled
 
 # Pattern Recognition Settings (NEW)
-PATTERN_RECOGNITION_ENABLED = os.getenv("PATTERN_RECOGNITION_ENABLED", "true").lower() == "true"
-PATTERN_LLM_THRESHOLD = float(os.getenv("PATTERN_LLM_THRESHOLD", "0.5"))  # Depth threshold for LLM analysis
-PATTERN_MIN_MESSAGES = int(os.getenv("PATTERN_MIN_MESSAGES", "5"))  # Minimum messages for pattern detection
-PATTERN_MIN_CONFIDENCE = float(os.getenv("PATTERN_MIN_CONFIDENCE", "0.6"))  # Minimum confidence for pattern detection
+PATTERN_RECOGNITION_ENABLED = settings.pattern_recognition_enabled
+PATTERN_LLM_THRESHOLD = settings.pattern_llm_threshold
+PATTERN_MIN_MESSAGES = settings.pattern_min_messages
+PATTERN_MIN_CONFIDENCE = settings.pattern_min_confidence
 
 # Emotional Progression Tracking Settings (NEW)
-PROGRESSION_TRACKING_ENABLED = os.getenv("PROGRESSION_TRACKING_ENABLED", "true").lower() == "true"
-PROGRESSION_STATE_LIMIT = int(os.getenv("PROGRESSION_STATE_LIMIT", "20"))  # Max emotional states to store
-PROGRESSION_MIN_STATES = int(os.getenv("PROGRESSION_MIN_STATES", "2"))  # Min states for progression analysis
+PROGRESSION_TRACKING_ENABLED = settings.progression_tracking_enabled
+PROGRESSION_STATE_LIMIT = settings.progression_state_limit
+PROGRESSION_MIN_STATES = settings.progression_min_states
 
 # Individual Indicator Settings (New 5-Indicator System)
-EMOTIONAL_AWARENESS_ENABLED = os.getenv("EMOTIONAL_AWARENESS_ENABLED", "true").lower() == "true"
-COGNITIVE_PATTERNS_ENABLED = os.getenv("COGNITIVE_PATTERNS_ENABLED", "true").lower() == "true"
-RELATIONAL_PATTERNS_ENABLED = os.getenv("RELATIONAL_PATTERNS_ENABLED", "true").lower() == "true"
-PERSONALITY_TYPES_ENABLED = os.getenv("PERSONALITY_TYPES_ENABLED", "true").lower() == "true"
-IFS_ENABLED = os.getenv("IFS_ENABLED", "true").lower() == "true"
+EMOTIONAL_AWARENESS_ENABLED = settings.emotional_awareness_enabled
+COGNITIVE_PATTERNS_ENABLED = settings.cognitive_patterns_enabled
+RELATIONAL_PATTERNS_ENABLED = settings.relational_patterns_enabled
+PERSONALITY_TYPES_ENABLED = settings.personality_types_enabled
+IFS_ENABLED = settings.ifs_enabled
 
 # Indicator Analysis Intervals (analyze every N messages)
-EMOTIONAL_AWARENESS_INTERVAL = int(os.getenv("EMOTIONAL_AWARENESS_INTERVAL", "2"))
-COGNITIVE_PATTERNS_INTERVAL = int(os.getenv("COGNITIVE_PATTERNS_INTERVAL", "2"))
-RELATIONAL_PATTERNS_INTERVAL = int(os.getenv("RELATIONAL_PATTERNS_INTERVAL", "3"))
-PERSONALITY_TYPES_INTERVAL = int(os.getenv("PERSONALITY_TYPES_INTERVAL", "3"))
-IFS_INTERVAL = int(os.getenv("IFS_INTERVAL", "3"))
+EMOTIONAL_AWARENESS_INTERVAL = settings.emotional_awareness_interval
+COGNITIVE_PATTERNS_INTERVAL = settings.cognitive_patterns_interval
+RELATIONAL_PATTERNS_INTERVAL = settings.relational_patterns_interval
+PERSONALITY_TYPES_INTERVAL = settings.personality_types_interval
+IFS_INTERVAL = settings.ifs_interval
 
 # Indicator Window Sizes (number of recent messages to analyze)
-EMOTIONAL_AWARENESS_WINDOW = int(os.getenv("EMOTIONAL_AWARENESS_WINDOW", "10"))
-COGNITIVE_PATTERNS_WINDOW = int(os.getenv("COGNITIVE_PATTERNS_WINDOW", "10"))
-RELATIONAL_PATTERNS_WINDOW = int(os.getenv("RELATIONAL_PATTERNS_WINDOW", "10"))
-PERSONALITY_TYPES_WINDOW = int(os.getenv("PERSONALITY_TYPES_WINDOW", "10"))
-IFS_WINDOW = int(os.getenv("IFS_WINDOW", "10"))
+EMOTIONAL_AWARENESS_WINDOW = settings.emotional_awareness_window
+COGNITIVE_PATTERNS_WINDOW = settings.cognitive_patterns_window
+RELATIONAL_PATTERNS_WINDOW = settings.relational_patterns_window
+PERSONALITY_TYPES_WINDOW = settings.personality_types_window
+IFS_WINDOW = settings.ifs_window
 
 # Indicator Confidence Thresholds
-EMOTIONAL_AWARENESS_MIN_CONFIDENCE = float(os.getenv("EMOTIONAL_AWARENESS_MIN_CONFIDENCE", "0.5"))
-COGNITIVE_PATTERNS_MIN_CONFIDENCE = float(os.getenv("COGNITIVE_PATTERNS_MIN_CONFIDENCE", "0.5"))
-RELATIONAL_PATTERNS_MIN_CONFIDENCE = float(os.getenv("RELATIONAL_PATTERNS_MIN_CONFIDENCE", "0.5"))
-PERSONALITY_TYPES_MIN_CONFIDENCE = float(os.getenv("PERSONALITY_TYPES_MIN_CONFIDENCE", "0.5"))
-IFS_MIN_CONFIDENCE = float(os.getenv("IFS_MIN_CONFIDENCE", "0.5"))
+EMOTIONAL_AWARENESS_MIN_CONFIDENCE = settings.emotional_awareness_min_confidence
+COGNITIVE_PATTERNS_MIN_CONFIDENCE = settings.cognitive_patterns_min_confidence
+RELATIONAL_PATTERNS_MIN_CONFIDENCE = settings.relational_patterns_min_confidence
+PERSONALITY_TYPES_MIN_CONFIDENCE = settings.personality_types_min_confidence
+IFS_MIN_CONFIDENCE = settings.ifs_min_confidence
 
 # LLM Models for Analysis
-PSYCHOLOGY_LLM_MODEL = os.getenv("PSYCHOLOGY_LLM_MODEL", "gpt-3.5-turbo")
+PSYCHOLOGY_LLM_MODEL = settings.psychology_llm_model
+
+# AI Response Language Settings
+AI_RESPONSE_LANGUAGE = settings.ai_response_language
+AI_FORCE_LANGUAGE = settings.ai_force_language
+
+# AI Response Control Settings
+AI_TEMPERATURE = settings.ai_temperature
+AI_MAX_TOKENS = settings.ai_max_tokens
+AI_PRESENCE_PENALTY = settings.ai_presence_penalty
+AI_FREQUENCY_PENALTY = settings.ai_frequency_penalty
+AI_MAX_RETRIES = settings.ai_max_retries
+AI_CONTEXT_WINDOW = settings.ai_context_window
+AI_MAX_CONCURRENT_REQUESTS = settings.ai_max_concurrent_requests
+
+# AI Response Cache Settings (exact-match cache for opening turns)
+AI_RESPONSE_CACHE_ENABLED = settings.ai_response_cache_enabled
+AI_RESPONSE_CACHE_TTL = settings.ai_response_cache_ttl
+AI_RESPONSE_CACHE_MAXSIZE = settings.ai_response_cache_maxsize
+
+# Psychology Report Settings
+REPORT_WORKER_COUNT = settings.report_worker_count
+ANALYSIS_CACHE_TTL = settings.analysis_cache_ttl
+ANALYSIS_CACHE_MAXSIZE = settings.analysis_cache_maxsize
+REPORT_EVENTS_MAX_DURATION = settings.report_events_max_duration
+
+# Indicator Configuration (built once at import; read-only so callers can't
+# corrupt the shared instance - copy with dict(...) before mutating)
+_INDICATOR_CONFIG = MappingProxyType({
+    'emotional_awareness': MappingProxyType({
+        'enabled': EMOTIONAL_AWARENESS_ENABLED,
+        'analysis_interval': EMOTIONAL_AWARENESS_INTERVAL,
+        'window_size': EMOTIONAL_AWARENESS_WINDOW,
+        'confidence_threshold': EMOTIONAL_AWARENESS_MIN_CONFIDENCE,
+        'llm_model': PSYCHOLOGY_LLM_MODEL
+    }),
+    'cognitive_patterns': MappingProxyType({
+        'enabled': COGNITIVE_PATTERNS_ENABLED,
+        'analysis_interval': COGNITIVE_PATTERNS_INTERVAL,
+        'window_size': COGNITIVE_PATTERNS_WINDOW,
+        'confidence_threshold': COGNITIVE_PATTERNS_MIN_CONFIDENCE,
+        'llm_model': PSYCHOLOGY_LLM_MODEL
+    }),
+    'relational_patterns': MappingProxyType({
+        'enabled': RELATIONAL_PATTERNS_ENABLED,
+        'analysis_interval': RELATIONAL_PATTERNS_INTERVAL,
+        'window_size': RELATIONAL_PATTERNS_WINDOW,
+        'confidence_threshold': RELATIONAL_PATTERNS_MIN_CONFIDENCE,
+        'llm_model': PSYCHOLOGY_LLM_MODEL
+    }),
+    'personality_types': MappingProxyType({
+        'enabled': PERSONALITY_TYPES_ENABLED,
+        'analysis_interval': PERSONALITY_TYPES_INTERVAL,
+        'window_size': PERSONALITY_TYPES_WINDOW,
+        'confidence_threshold': PERSONALITY_TYPES_MIN_CONFIDENCE,
+        'llm_model': PSYCHOLOGY_LLM_MODEL
+    }),
+    'ifs': MappingProxyType({
+        'enabled': IFS_ENABLED,
+        'analysis_interval': IFS_INTERVAL,
+        'window_size': IFS_WINDOW,
+        'confidence_threshold': IFS_MIN_CONFIDENCE,
+        'llm_model': PSYCHOLOGY_LLM_MODEL
+    })
+})
 
-# Indicator Configuration Helper
 def get_indicator_config():
     """Get complete indicator configuration from environment variables."""
-    return {
-        'emotional_awareness': {
-            'enabled': EMOTIONAL_AWARENESS_ENABLED,
-            'analysis_interval': EMOTIONAL_AWARENESS_INTERVAL,
-            'window_size': EMOTIONAL_AWARENESS_WINDOW,
-            'confidence_threshold': EMOTIONAL_AWARENESS_MIN_CONFIDENCE,
-            'llm_model': PSYCHOLOGY_LLM_MODEL
-        },
-        'cognitive_patterns': {
-            'enabled': COGNITIVE_PATTERNS_ENABLED,
-            'analysis_interval': COGNITIVE_PATTERNS_INTERVAL,
-            'window_size': COGNITIVE_PATTERNS_WINDOW,
-            'confidence_threshold': COGNITIVE_PATTERNS_MIN_CONFIDENCE,
-            'llm_model': PSYCHOLOGY_LLM_MODEL
-        },
-        'relational_patterns': {
-            'enabled': RELATIONAL_PATTERNS_ENABLED,
-            'analysis_interval': RELATIONAL_PATTERNS_INTERVAL,
-            'window_size': RELATIONAL_PATTERNS_WINDOW,
-            'confidence_threshold': RELATIONAL_PATTERNS_MIN_CONFIDENCE,
-            'llm_model': PSYCHOLOGY_LLM_MODEL
-        },
-        'personality_types': {
-            'enabled': PERSONALITY_TYPES_ENABLED,
-            'analysis_interval': PERSONALITY_TYPES_INTERVAL,
-            'window_size': PERSONALITY_TYPES_WINDOW,
-            'confidence_threshold': PERSONALITY_TYPES_MIN_CONFIDENCE,
-            'llm_model': PSYCHOLOGY_LLM_MODEL
-        },
-        'ifs': {
-            'enabled': IFS_ENABLED,
-            'analysis_interval': IFS_INTERVAL,
-            'window_size': IFS_WINDOW,
-            'confidence_threshold': IFS_MIN_CONFIDENCE,
-            'llm_model': PSYCHOLOGY_LLM_MODEL
-        }
-    }
-
-# Backward compatibility alias
-get_framework_config = get_indicator_config
+    return _INDICATOR_CONFIG
 
-# AI Response Language Settings
-AI_RESPONSE_LANGUAGE = os.getenv("AI_RESPONSE_LANGUAGE", "chinese")  # Default to Chinese
-AI_FORCE_LANGUAGE = os.getenv("AI_FORCE_LANGUAGE", "true").lower() == "true"  # Force language regardless of input
+# Enabled indicators as (name, analysis_interval, window_size,
+# confidence_threshold, llm_model) tuples, so per-message loops skip
+# disabled indicators without walking the config dicts
+ACTIVE_INDICATORS = tuple(
+    (name, cfg['analysis_interval'], cfg['window_size'], cfg['confidence_threshold'], cfg['llm_model'])
+    for name, cfg in _INDICATOR_CONFIG.items()
+    if cfg['enabled']
+) if PSYCHOLOGY_DETECTION_ENABLED else ()
 
-# AI Response Control Settings
-AI_TEMPERATURE = float(os.getenv("AI_TEMPERATURE", "0.7"))  # Creativity vs consistency (0.0-2.0)
-AI_MAX_TOKENS = int(os.getenv("AI_MAX_TOKENS", "1500"))  # Max response length (increased for better responses)
-AI_PRESENCE_PENALTY = float(os.getenv("AI_PRESENCE_PENALTY", "0.3"))  # Reduce repetition (0.0-2.0)
-AI_FREQUENCY_PENALTY = float(os.getenv("AI_FREQUENCY_PENALTY", "0.3"))  # Encourage word diversity (0.0-2.0)
+# Backward compatibility aliases
+get_framework_config = get_indicator_config
+ACTIVE_FRAMEWORKS = ACTIVE_INDICATORS
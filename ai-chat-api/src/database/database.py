@@ -1,27 +1,135 @@
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
-from src.config.settings import DATABASE_URL
+import orjson
+from sqlalchemy import create_engine, event, make_url, text
+from sqlalchemy.orm import Session, sessionmaker
+from src.config.settings import (
+    DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE,
+    IS_POSTGRES, IS_SQLITE
+)
 from src.database.models import Base
-# Import psychology models to register them with Base.metadata
-from src.database import psychology_models  # noqa: F401
-# Import questionnaire models to register them with Base.metadata
-from src.database import questionnaire_models  # noqa: F401
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
-# Create engine with appropriate connection arguments
-if "sqlite" in DATABASE_URL:
-    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-else:
-    engine = create_engine(
+
+def _json_serializer(obj) -> str:
+    """Serialize JSON columns with orjson (SQLAlchemy expects str, not bytes)"""
+    return orjson.dumps(obj).decode("utf-8")
+
+
+def _sqlite_pragmas(dbapi_conn, _connection_record):
+    """
+    Per-connection SQLite tuning: WAL lets readers run alongside the writer,
+    and synchronous=NORMAL (safe under WAL) skips the fsync on every commit
+    """
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB page cache
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+    cursor.close()
+
+
+def _create_engine():
+    """
+    Create the engine with appropriate connection arguments; JSON columns (e.g.
+    the large report_data payloads) are (de)serialized with orjson instead of
+    stdlib json
+    """
+    if IS_SQLITE:
+        engine = create_engine(
+            DATABASE_URL,
+            connect_args={"check_same_thread": False},
+            json_serializer=_json_serializer,
+            json_deserializer=orjson.loads
+        )
+        event.listen(engine, "connect", _sqlite_pragmas)
+        return engine
+    driver_args = {}
+    if make_url(DATABASE_URL).get_driver_name() == "psycopg2":
+        # INSERT executemany already goes out as multi-row VALUES; also page
+        # UPDATE/DELETE executemany through psycopg2's execute_batch
+        driver_args["executemany_mode"] = "values_plus_batch"
+    return create_engine(
         DATABASE_URL,
         pool_pre_ping=True,
-        pool_size=5,
-        max_overflow=10
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        # Reuse the most recently returned connection so a few stay hot and
+        # idle overflow connections age out via pool_recycle
+        pool_use_lifo=True,
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads,
+        **driver_args
     )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Table listing used to verify the schema, built once
+_TABLES_QUERY = text(
+    "SELECT tablename FROM pg_tables WHERE schemaname = 'public'"
+    if IS_POSTGRES else
+    "SELECT name FROM sqlite_master WHERE type='table'"
+)
+
+
+# One engine per process, created on first use
+_engine = None
+_session_factory = sessionmaker(autocommit=False, autoflush=False)
+
+
+def get_engine():
+    """Return the process-wide engine, creating it on first use"""
+    global _engine
+    if _engine is None:
+        _engine = _create_engine()
+        _session_factory.configure(bind=_engine)
+    return _engine
+
+
+def SessionLocal() -> Session:
+    """Create a new session bound to the process-wide engine"""
+    get_engine()
+    return _session_factory()
+
+
+def _reset_pool_after_fork():
+    """Give a forked child a fresh pool instead of the parent's connections"""
+    if _engine is not None:
+        # close=False: the parent still owns those sockets
+        _engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pool_after_fork)
+
+
+def __getattr__(name):
+    # `engine` stays importable as a module attribute for existing callers
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_models_loaded = False
+
+
+def _ensure_models_loaded():
+    """
+    Import the psychology and questionnaire models so their tables are
+    registered with Base.metadata.
+
+    Deferred to first database use so scripts that import this module
+    without touching those tables don't pay for building the mappers.
+    """
+    global _models_loaded
+    if _models_loaded:
+        return
+    from src.database import psychology_models  # noqa: F401
+    from src.database import questionnaire_models  # noqa: F401
+    _models_loaded = True
 
 
 def init_db():
@@ -31,29 +139,52 @@ def init_db():
     """
     try:
         logger.info("Initializing database...")
-        Base.metadata.create_all(bind=engine)
-        logger.info("✓ Database tables created/verified successfully")
+        _ensure_models_loaded()
+        engine = get_engine()
 
-        # Verify tables were created
+        # One listing query instead of create_all's per-table existence checks;
+        # on a warm database there is nothing to create
         with engine.connect() as conn:
-            if "postgresql" in DATABASE_URL:
-                result = conn.execute(text(
-                    "SELECT tablename FROM pg_tables WHERE schemaname = 'public'"
-                ))
-            else:  # SQLite
-                result = conn.execute(text(
-                    "SELECT name FROM sqlite_master WHERE type='table'"
-                ))
-            tables = [row[0] for row in result]
-            logger.info(f"✓ Available tables: {tables}")
+            present = set(conn.execute(_TABLES_QUERY).scalars())
+        missing = [table for name, table in Base.metadata.tables.items() if name not in present]
+
+        if missing:
+            Base.metadata.create_all(bind=engine, tables=missing, checkfirst=False)
+            logger.info(f"✓ Created tables: {[table.name for table in missing]}")
+        else:
+            logger.info("✓ Database schema up to date")
+        logger.info(f"✓ Available tables: {sorted(present.union(table.name for table in missing))}")
 
     except Exception as e:
         logger.error(f"Error initializing database: {e}")
         raise
 
 
+def warm_pool(n: int = None):
+    """
+    Open (and return to the pool) n connections so the first requests after
+    startup don't pay connection setup latency. Defaults to the pool size;
+    a no-op for SQLite, where connecting is cheap.
+    """
+    if IS_SQLITE:
+        return
+    engine = get_engine()
+    n = n or engine.pool.size()
+    connections = []
+    try:
+        for _ in range(n):
+            conn = engine.connect()
+            connections.append(conn)
+            conn.execute(text("SELECT 1"))
+        logger.info(f"✓ Warmed {len(connections)} database connections")
+    finally:
+        for conn in connections:
+            conn.close()
+
+
 def get_db():
     """Database dependency for FastAPI"""
+    _ensure_models_loaded()
     db = SessionLocal()
     try:
         yield db
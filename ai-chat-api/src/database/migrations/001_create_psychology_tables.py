@@ -8,13 +8,35 @@ Run with: python -m src.database.migrations.001_create_psychology_tables
 """
 
 from sqlalchemy import create_engine, text
-from src.config.settings import DATABASE_URL
+from src.config.settings import DATABASE_URL, IS_POSTGRES
 from src.database.psychology_models import Base
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_TABLES_QUERY = text(
+    "SELECT tablename FROM pg_tables WHERE schemaname = 'public'"
+    if IS_POSTGRES else
+    "SELECT name FROM sqlite_master WHERE type='table'"
+)
+
+# Tables this migration is expected to create
+EXPECTED_TABLES = frozenset({
+    'user_profiles',
+    'psychology_assessments',
+    'questionnaires',
+    'questionnaire_questions',
+    'questionnaire_responses',
+    'ifs_parts_detections',
+    'cognitive_patterns_detections',
+    'attachment_styles',
+    'narrative_identities',
+    'personality_styles',
+    'analysis_texts',
+    'psychology_reports'
+})
+
 
 def upgrade():
     """Create all psychology tables"""
@@ -29,36 +51,11 @@ def upgrade():
 
         # Verify tables were created
         with engine.connect() as conn:
-            # Check if using PostgreSQL or SQLite
-            if "postgresql" in DATABASE_URL:
-                result = conn.execute(text(
-                    "SELECT tablename FROM pg_tables WHERE schemaname = 'public'"
-                ))
-            else:  # SQLite
-                result = conn.execute(text(
-                    "SELECT name FROM sqlite_master WHERE type='table'"
-                ))
-
-            tables = [row[0] for row in result]
+            tables = conn.execute(_TABLES_QUERY).scalars().all()
             logger.info(f"✓ Available tables: {tables}")
 
             # Check for our new tables
-            expected_tables = [
-                'user_profiles',
-                'psychology_assessments',
-                'questionnaires',
-                'questionnaire_questions',
-                'questionnaire_responses',
-                'ifs_parts_detections',
-                'cognitive_patterns_detections',
-                'attachment_styles',
-                'narrative_identities',
-                'personality_styles',
-                'analysis_texts',
-                'psychology_reports'
-            ]
-
-            missing_tables = [t for t in expected_tables if t not in tables]
+            missing_tables = sorted(EXPECTED_TABLES.difference(tables))
             if missing_tables:
                 logger.warning(f"⚠ Missing tables: {missing_tables}")
             else:
@@ -0,0 +1,65 @@
+"""
+Migration: Add Report Status Index
+
+Adds the composite (id, generation_status) index on psychology_reports used
+by the report status polling endpoints. New databases get it from
+create_all(); this adds it to existing ones.
+
+Run with: python -m src.database.migrations.002_add_report_status_index
+"""
+
+from sqlalchemy import create_engine
+from src.config.settings import DATABASE_URL
+from src.database.psychology_models import PsychologyReport
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _status_index():
+    return next(
+        index for index in PsychologyReport.__table__.indexes
+        if index.name == "ix_reports_id_status"
+    )
+
+
+def upgrade():
+    """Create ix_reports_id_status"""
+    logger.info("Starting migration: Add report status index")
+
+    engine = create_engine(DATABASE_URL)
+
+    try:
+        _status_index().create(bind=engine, checkfirst=True)
+        logger.info("✓ ix_reports_id_status created")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Migration failed: {e}")
+        raise
+
+
+def downgrade():
+    """Drop ix_reports_id_status"""
+    logger.info("Starting rollback: Drop report status index")
+
+    engine = create_engine(DATABASE_URL)
+
+    try:
+        _status_index().drop(bind=engine, checkfirst=True)
+        logger.info("✓ ix_reports_id_status dropped")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Rollback failed: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "downgrade":
+        downgrade()
+    else:
+        upgrade()
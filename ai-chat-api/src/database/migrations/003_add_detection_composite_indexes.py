@@ -0,0 +1,81 @@
+"""
+Migration: Add Detection Composite Indexes
+
+Adds composite indexes matching the dominant-element and analysis-text
+lookups, and drops the single-column assessment_id indexes they make
+redundant (assessment_id is their leading column). New databases get the
+same layout from create_all(); this updates existing ones.
+
+Run with: python -m src.database.migrations.003_add_detection_composite_indexes
+"""
+
+from sqlalchemy import create_engine, Index
+from src.config.settings import DATABASE_URL
+from src.database.psychology_models import IFSPartsDetection, CognitivePatternsDetection, AnalysisText
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_MODELS = (IFSPartsDetection, CognitivePatternsDetection, AnalysisText)
+
+
+def _composite_indexes():
+    return [index for model in _MODELS for index in model.__table__.indexes if len(index.columns) > 1]
+
+
+def _legacy_indexes():
+    """Single-column assessment_id indexes created by migration 001"""
+    return [
+        Index(f"ix_{model.__tablename__}_assessment_id", model.__table__.c.assessment_id)
+        for model in _MODELS
+    ]
+
+
+def upgrade():
+    """Create the composite indexes and drop the redundant single-column ones"""
+    logger.info("Starting migration: Add detection composite indexes")
+
+    engine = create_engine(DATABASE_URL)
+
+    try:
+        for index in _composite_indexes():
+            index.create(bind=engine, checkfirst=True)
+            logger.info(f"✓ {index.name} created")
+        for index in _legacy_indexes():
+            index.drop(bind=engine, checkfirst=True)
+            logger.info(f"✓ {index.name} dropped")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Migration failed: {e}")
+        raise
+
+
+def downgrade():
+    """Restore the single-column indexes and drop the composite ones"""
+    logger.info("Starting rollback: Drop detection composite indexes")
+
+    engine = create_engine(DATABASE_URL)
+
+    try:
+        for index in _legacy_indexes():
+            index.create(bind=engine, checkfirst=True)
+            logger.info(f"✓ {index.name} created")
+        for index in _composite_indexes():
+            index.drop(bind=engine, checkfirst=True)
+            logger.info(f"✓ {index.name} dropped")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Rollback failed: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "downgrade":
+        downgrade()
+    else:
+        upgrade()
@@ -0,0 +1,77 @@
+"""
+Migration: Convert JSON Columns to JSONB
+
+The psychology models used PostgreSQL's text JSON type; they now declare
+JSONB. New databases get JSONB from create_all(); this converts the columns
+of existing PostgreSQL databases in place. SQLite keeps generic JSON, so the
+migration is a no-op there.
+
+Run with: python -m src.database.migrations.004_convert_json_to_jsonb
+"""
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects.postgresql import JSONB as PG_JSONB
+from src.config.settings import DATABASE_URL, IS_POSTGRES
+from src.database.models import Base
+import src.database.psychology_models  # noqa: F401 - registers the tables
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _jsonb_columns():
+    for table in Base.metadata.sorted_tables:
+        for column in table.columns:
+            if isinstance(column.type, PG_JSONB):
+                yield table.name, column.name
+
+
+def _convert(target):
+    if not IS_POSTGRES:
+        logger.info("✓ Not PostgreSQL, nothing to convert")
+        return
+
+    engine = create_engine(DATABASE_URL)
+
+    with engine.begin() as conn:
+        for table, column in _jsonb_columns():
+            conn.execute(text(
+                f'ALTER TABLE {table} ALTER COLUMN "{column}" TYPE {target} USING "{column}"::{target}'
+            ))
+            logger.info(f"✓ {table}.{column} -> {target}")
+
+
+def upgrade():
+    """Convert the psychology JSON columns to JSONB"""
+    logger.info("Starting migration: Convert JSON columns to JSONB")
+
+    try:
+        _convert("jsonb")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Migration failed: {e}")
+        raise
+
+
+def downgrade():
+    """Convert the psychology JSONB columns back to JSON"""
+    logger.info("Starting rollback: Convert JSONB columns to JSON")
+
+    try:
+        _convert("json")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Rollback failed: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "downgrade":
+        downgrade()
+    else:
+        upgrade()
@@ -0,0 +1,99 @@
+"""
+Migration: Add Timestamp Server Defaults
+
+The psychology and questionnaire timestamp columns have a UTC server default
+(utc_now) as a backstop for rows written outside the ORM; the ORM itself
+still stamps them with datetime.utcnow. New databases get the defaults from
+create_all(); this adds them to existing PostgreSQL databases.
+
+SQLite cannot alter a column default without rebuilding the table, and the
+Python-side defaults already cover existing SQLite databases, so they are
+left unchanged.
+
+Run with: python -m src.database.migrations.005_add_timestamp_server_defaults
+"""
+
+from sqlalchemy import create_engine, inspect, text, DateTime
+from src.config.settings import DATABASE_URL, IS_SQLITE
+from src.database.models import Base, utc_now
+import src.database.psychology_models  # noqa: F401 - registers the tables
+import src.database.questionnaire_models  # noqa: F401 - registers the tables
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _server_default_columns():
+    """{table: [column names]} for DateTime columns with a server default"""
+    columns = {}
+    for table in Base.metadata.sorted_tables:
+        names = [
+            column.name for column in table.columns
+            if isinstance(column.type, DateTime) and column.server_default is not None
+        ]
+        if names:
+            columns[table] = names
+    return columns
+
+
+def upgrade():
+    """Add UTC now() defaults to the timestamp columns"""
+    logger.info("Starting migration: Add timestamp server defaults")
+
+    if IS_SQLITE:
+        logger.info("✓ SQLite keeps its existing defaults, nothing to do")
+        return True
+
+    engine = create_engine(DATABASE_URL)
+
+    try:
+        existing = set(inspect(engine).get_table_names())
+        default = str(utc_now().compile(dialect=engine.dialect))
+        with engine.begin() as conn:
+            for table, names in _server_default_columns().items():
+                if table.name not in existing:
+                    continue
+                for name in names:
+                    conn.execute(text(f'ALTER TABLE {table.name} ALTER COLUMN "{name}" SET DEFAULT {default}'))
+                logger.info(f"✓ {table.name}: {', '.join(names)}")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Migration failed: {e}")
+        raise
+
+
+def downgrade():
+    """Drop the timestamp column defaults (PostgreSQL only)"""
+    logger.info("Starting rollback: Drop timestamp server defaults")
+
+    engine = create_engine(DATABASE_URL)
+
+    try:
+        if IS_SQLITE:
+            logger.info("✓ SQLite defaults were not changed, nothing to do")
+            return True
+
+        existing = set(inspect(engine).get_table_names())
+        with engine.begin() as conn:
+            for table, names in _server_default_columns().items():
+                if table.name not in existing:
+                    continue
+                for name in names:
+                    conn.execute(text(f'ALTER TABLE {table.name} ALTER COLUMN "{name}" DROP DEFAULT'))
+                logger.info(f"✓ {table.name}: {', '.join(names)}")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Rollback failed: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "downgrade":
+        downgrade()
+    else:
+        upgrade()
@@ -0,0 +1,79 @@
+"""
+Migration: Add Report Status Enum
+
+Converts psychology_reports.generation_status from VARCHAR to the native
+report_generation_status ENUM on PostgreSQL. New databases get the type from
+create_all(); SQLite stores the enum as VARCHAR, so the migration is a no-op
+there.
+
+Run with: python -m src.database.migrations.006_add_report_status_enum
+"""
+
+from sqlalchemy import create_engine, text
+from src.config.settings import DATABASE_URL, IS_POSTGRES
+from src.database.psychology_models import ReportGenerationStatus
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def upgrade():
+    """Create report_generation_status and convert generation_status to it"""
+    logger.info("Starting migration: Add report status enum")
+
+    if not IS_POSTGRES:
+        logger.info("✓ Not PostgreSQL, nothing to convert")
+        return True
+
+    engine = create_engine(DATABASE_URL)
+
+    try:
+        with engine.begin() as conn:
+            ReportGenerationStatus.create(conn, checkfirst=True)
+            conn.execute(text(
+                "ALTER TABLE psychology_reports "
+                "ALTER COLUMN generation_status TYPE report_generation_status "
+                "USING generation_status::report_generation_status"
+            ))
+        logger.info("✓ psychology_reports.generation_status -> report_generation_status")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Migration failed: {e}")
+        raise
+
+
+def downgrade():
+    """Convert generation_status back to VARCHAR and drop the enum type"""
+    logger.info("Starting rollback: Drop report status enum")
+
+    if not IS_POSTGRES:
+        logger.info("✓ Not PostgreSQL, nothing to convert")
+        return True
+
+    engine = create_engine(DATABASE_URL)
+
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(
+                "ALTER TABLE psychology_reports "
+                "ALTER COLUMN generation_status TYPE VARCHAR(50) "
+                "USING generation_status::text"
+            ))
+            ReportGenerationStatus.drop(conn, checkfirst=True)
+        logger.info("✓ psychology_reports.generation_status -> VARCHAR(50)")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Rollback failed: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "downgrade":
+        downgrade()
+    else:
+        upgrade()
@@ -1,11 +1,35 @@
 from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql.expression import FunctionElement
 from datetime import datetime
 
 Base = declarative_base()
 
 
+class utc_now(FunctionElement):
+    """
+    Current UTC time as a naive timestamp, for server-side column defaults
+
+    Timestamps are stored as naive UTC (datetime.utcnow), so the database-side
+    default must not depend on the server's TimeZone setting.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utc_now, "postgresql")
+def _pg_utc_now(element, compiler, **kw):
+    return "timezone('utc', now())"
+
+
+@compiles(utc_now)
+def _default_utc_now(element, compiler, **kw):
+    # SQLite's CURRENT_TIMESTAMP is already UTC
+    return "CURRENT_TIMESTAMP"
+
+
 class Conversation(Base):
     """Match existing schema from main project"""
     __tablename__ = "conversations"
@@ -15,7 +39,7 @@ class Conversation(Base):
     user_id = Column(String(255), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    extra_data = Column("metadata", JSON, default={})
+    extra_data = Column("metadata", JSON, default=dict)
 
     messages = relationship("Message", back_populates="conversation", cascade="all, delete-orphan")
 
@@ -29,6 +53,6 @@ class Message(Base):
     role = Column(String(50), nullable=False)  # 'user', 'assistant', 'system'
     content = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
-    extra_data = Column("metadata", JSON, default={})
+    extra_data = Column("metadata", JSON, default=dict)
 
     conversation = relationship("Conversation", back_populates="messages")
@@ -14,11 +14,18 @@ New models for comprehensive psychology data tracking including:
 - Psychology reports
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Numeric
-from sqlalchemy.dialects.postgresql import JSON as JSONB
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Numeric, Index, JSON, Enum
+from sqlalchemy.dialects.postgresql import JSONB as PG_JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
-from .models import Base
+from .models import Base, utc_now
+
+# Binary JSONB on PostgreSQL, generic JSON everywhere else (SQLite)
+JSONB = PG_JSONB().with_variant(JSON(), "sqlite")
+
+# Report lifecycle; a native ENUM type on PostgreSQL, VARCHAR elsewhere
+REPORT_GENERATION_STATUSES = ('pending', 'processing', 'completed', 'failed')
+ReportGenerationStatus = Enum(*REPORT_GENERATION_STATUSES, name='report_generation_status')
 
 
 class UserProfile(Base):
@@ -36,8 +43,8 @@ class UserProfile(Base):
     language_preference = Column(String(10), default='zh')
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=utc_now())
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=utc_now(), onupdate=datetime.utcnow)
 
     # Relationships
     assessments = relationship("PsychologyAssessment", back_populates="user", cascade="all, delete-orphan")
@@ -67,16 +74,16 @@ class PsychologyAssessment(Base):
     growth_potential_confidence = Column(Numeric(3, 2))
 
     # Sub-dimension scores (JSONB)
-    sub_dimension_scores = Column(JSONB, default={})
+    sub_dimension_scores = Column(JSONB, default=dict)
 
     # IFS-specific metrics
-    ifs_metrics = Column(JSONB, default={})
+    ifs_metrics = Column(JSONB, default=dict)
 
     # Attachment profile
-    attachment_profile = Column(JSONB, default={})
+    attachment_profile = Column(JSONB, default=dict)
 
     # Narrative profile
-    narrative_profile = Column(JSONB, default={})
+    narrative_profile = Column(JSONB, default=dict)
 
     # Dominant elements
     dominant_ifs_part = Column(String(50))
@@ -97,12 +104,12 @@ class PsychologyAssessment(Base):
     completion_percentage = Column(Integer, default=0)
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=utc_now())
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=utc_now(), onupdate=datetime.utcnow)
     completed_at = Column(DateTime)
 
     # Extra data
-    extra_data = Column(JSONB, default={})
+    extra_data = Column(JSONB, default=dict)
 
     # Relationships
     user = relationship("UserProfile", back_populates="assessments")
@@ -136,8 +143,8 @@ class Questionnaire(Base):
     is_active = Column(Boolean, default=True)
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=utc_now())
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=utc_now(), onupdate=datetime.utcnow)
 
     # Relationships
     questions = relationship("QuestionnaireQuestion", back_populates="questionnaire", cascade="all, delete-orphan")
@@ -172,7 +179,7 @@ class QuestionnaireQuestion(Base):
     max_value = Column(Integer)
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=utc_now())
 
     # Relationships
     questionnaire = relationship("Questionnaire", back_populates="questions")
@@ -191,14 +198,14 @@ class QuestionnaireResponse(Base):
     status = Column(String(50), default='in_progress')
 
     # Responses data (structured by section)
-    responses = Column(JSONB, nullable=False, default={})
+    responses = Column(JSONB, nullable=False, default=dict)
 
     # Calculated scores
     section_scores = Column(JSONB)
     dimension_scores = Column(JSONB)
 
     # Timing
-    started_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, default=datetime.utcnow, server_default=utc_now())
     completed_at = Column(DateTime)
     time_spent_seconds = Column(Integer)
 
@@ -208,7 +215,7 @@ class QuestionnaireResponse(Base):
     completion_percentage = Column(Integer)
 
     # Extra data
-    extra_data = Column(JSONB, default={})
+    extra_data = Column(JSONB, default=dict)
 
     # Relationships
     user = relationship("UserProfile", back_populates="questionnaire_responses")
@@ -218,10 +225,14 @@ class QuestionnaireResponse(Base):
 class IFSPartsDetection(Base):
     """IFS parts detection records"""
     __tablename__ = "ifs_parts_detections"
+    __table_args__ = (
+        # Dominant part lookup: assessment_id + detected, ordered by confidence
+        Index("ix_ifs_parts_assessment_dominant", "assessment_id", "detected", "confidence_score"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(String(255), ForeignKey("user_profiles.user_id", ondelete="CASCADE"), nullable=False, index=True)
-    assessment_id = Column(Integer, ForeignKey("psychology_assessments.id", ondelete="CASCADE"), index=True)
+    assessment_id = Column(Integer, ForeignKey("psychology_assessments.id", ondelete="CASCADE"))
 
     # Source
     source_type = Column(String(50), nullable=False, index=True)
@@ -246,11 +257,11 @@ class IFSPartsDetection(Base):
     evidence_data = Column(JSONB)
 
     # Timestamps
-    first_detected_at = Column(DateTime, default=datetime.utcnow)
-    last_detected_at = Column(DateTime, default=datetime.utcnow)
+    first_detected_at = Column(DateTime, default=datetime.utcnow, server_default=utc_now())
+    last_detected_at = Column(DateTime, default=datetime.utcnow, server_default=utc_now())
 
     # Extra data
-    extra_data = Column(JSONB, default={})
+    extra_data = Column(JSONB, default=dict)
 
     # Relationships
     assessment = relationship("PsychologyAssessment", back_populates="ifs_parts")
@@ -259,10 +270,14 @@ class IFSPartsDetection(Base):
 class CognitivePatternsDetection(Base):
     """Cognitive patterns detection records"""
     __tablename__ = "cognitive_patterns_detections"
+    __table_args__ = (
+        # Dominant pattern lookup: assessment_id + detected, ordered by detection count
+        Index("ix_cognitive_patterns_assessment_dominant", "assessment_id", "detected", "detection_count"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(String(255), ForeignKey("user_profiles.user_id", ondelete="CASCADE"), nullable=False, index=True)
-    assessment_id = Column(Integer, ForeignKey("psychology_assessments.id", ondelete="CASCADE"), index=True)
+    assessment_id = Column(Integer, ForeignKey("psychology_assessments.id", ondelete="CASCADE"))
 
     # Source
     source_type = Column(String(50), nullable=False, index=True)
@@ -282,11 +297,11 @@ class CognitivePatternsDetection(Base):
     evidence_examples = Column(JSONB)
 
     # Timestamps
-    first_detected_at = Column(DateTime, default=datetime.utcnow)
-    last_detected_at = Column(DateTime, default=datetime.utcnow)
+    first_detected_at = Column(DateTime, default=datetime.utcnow, server_default=utc_now())
+    last_detected_at = Column(DateTime, default=datetime.utcnow, server_default=utc_now())
 
     # Extra data
-    extra_data = Column(JSONB, default={})
+    extra_data = Column(JSONB, default=dict)
 
     # Relationships
     assessment = relationship("PsychologyAssessment", back_populates="cognitive_patterns")
@@ -324,11 +339,11 @@ class AttachmentStyle(Base):
     evidence_data = Column(JSONB)
 
     # Timestamps
-    detected_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    detected_at = Column(DateTime, default=datetime.utcnow, server_default=utc_now())
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=utc_now(), onupdate=datetime.utcnow)
 
     # Extra data
-    extra_data = Column(JSONB, default={})
+    extra_data = Column(JSONB, default=dict)
 
     # Relationships
     assessment = relationship("PsychologyAssessment", back_populates="attachment_style")
@@ -361,11 +376,11 @@ class NarrativeIdentity(Base):
     evidence_data = Column(JSONB)
 
     # Timestamps
-    detected_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    detected_at = Column(DateTime, default=datetime.utcnow, server_default=utc_now())
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=utc_now(), onupdate=datetime.utcnow)
 
     # Extra data
-    extra_data = Column(JSONB, default={})
+    extra_data = Column(JSONB, default=dict)
 
     # Relationships
     assessment = relationship("PsychologyAssessment", back_populates="narrative_identity")
@@ -395,11 +410,11 @@ class PersonalityStyle(Base):
     description_zh = Column(Text)
 
     # Timestamps
-    classified_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    classified_at = Column(DateTime, default=datetime.utcnow, server_default=utc_now())
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=utc_now(), onupdate=datetime.utcnow)
 
     # Extra data
-    extra_data = Column(JSONB, default={})
+    extra_data = Column(JSONB, default=dict)
 
     # Relationships
     assessment = relationship("PsychologyAssessment", back_populates="personality_style_obj")
@@ -408,10 +423,14 @@ class PersonalityStyle(Base):
 class AnalysisText(Base):
     """AI-generated analysis texts"""
     __tablename__ = "analysis_texts"
+    __table_args__ = (
+        # Existing-text lookup before saving a generated analysis
+        Index("ix_analysis_texts_lookup", "assessment_id", "analysis_type", "related_entity_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(String(255), ForeignKey("user_profiles.user_id", ondelete="CASCADE"), nullable=False, index=True)
-    assessment_id = Column(Integer, ForeignKey("psychology_assessments.id", ondelete="CASCADE"), index=True)
+    assessment_id = Column(Integer, ForeignKey("psychology_assessments.id", ondelete="CASCADE"))
 
     # Analysis type
     analysis_type = Column(String(50), nullable=False, index=True)
@@ -431,11 +450,11 @@ class AnalysisText(Base):
     confidence = Column(Numeric(3, 2))
 
     # Timestamps
-    generated_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    generated_at = Column(DateTime, default=datetime.utcnow, server_default=utc_now())
+    updated_at = Column(DateTime, default=datetime.utcnow, server_default=utc_now(), onupdate=datetime.utcnow)
 
     # Extra data
-    extra_data = Column(JSONB, default={})
+    extra_data = Column(JSONB, default=dict)
 
     # Relationships
     assessment = relationship("PsychologyAssessment", back_populates="analysis_texts")
@@ -444,6 +463,10 @@ class AnalysisText(Base):
 class PsychologyReport(Base):
     """Generated psychology reports"""
     __tablename__ = "psychology_reports"
+    __table_args__ = (
+        # Covers the status polls (id lookup returning only generation_status)
+        Index("ix_reports_id_status", "id", "generation_status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(String(255), ForeignKey("user_profiles.user_id", ondelete="CASCADE"), nullable=False, index=True)
@@ -463,16 +486,16 @@ class PsychologyReport(Base):
     file_size_bytes = Column(Integer)
 
     # Status
-    generation_status = Column(String(50), default='pending', index=True)
+    generation_status = Column(ReportGenerationStatus, default='pending', index=True)
     error_message = Column(Text)
 
     # Timestamps
-    requested_at = Column(DateTime, default=datetime.utcnow)
+    requested_at = Column(DateTime, default=datetime.utcnow, server_default=utc_now())
     generated_at = Column(DateTime)
     expires_at = Column(DateTime, index=True)
 
     # Extra data
-    extra_data = Column(JSONB, default={})
+    extra_data = Column(JSONB, default=dict)
 
     # Relationships
     assessment = relationship("PsychologyAssessment", back_populates="reports")
@@ -4,7 +4,7 @@ Database models for questionnaire system
 from sqlalchemy import Column, Integer, String, Text, ForeignKey, JSON, DateTime, Float
 from sqlalchemy.orm import relationship
 from datetime import datetime
-from src.database.models import Base
+from src.database.models import Base, utc_now
 
 
 class AssessmentQuestionnaire(Base):
@@ -15,7 +15,7 @@ class AssessmentQuestionnaire(Base):
     section = Column(String, nullable=False)  # e.g., "2.1"
     title = Column(String, nullable=False)
     marking_criteria = Column(JSON)  # Scoring rules and interpretation
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=utc_now())
 
     # Relationships
     questions = relationship("AssessmentQuestion", back_populates="questionnaire", cascade="all, delete-orphan")
@@ -34,7 +34,7 @@ class AssessmentQuestion(Base):
     sub_section = Column(String)  # For sub-sections (e.g., "2.2.1")
     dimension = Column(String)  # For dimensions (e.g., "Insight Depth")
     options = Column(JSON)  # For multiple choice questions
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=utc_now())
 
     # Relationships
     questionnaire = relationship("AssessmentQuestionnaire", back_populates="questions")
@@ -54,7 +54,7 @@ class AssessmentResponse(Base):
     category_scores = Column(JSON)  # Scores per category/dimension
     interpretation = Column(JSON)  # Interpretation based on marking criteria
 
-    completed_at = Column(DateTime, default=datetime.utcnow)
+    completed_at = Column(DateTime, default=datetime.utcnow, server_default=utc_now())
     extra_data = Column(JSON)  # Additional metadata
 
     # Relationships
@@ -70,7 +70,7 @@ class AssessmentAnswer(Base):
     response_id = Column(Integer, ForeignKey("assessment_responses.id"), nullable=False)
     question_id = Column(Integer, ForeignKey("assessment_questions.id"), nullable=False)
     answer_value = Column(Integer, nullable=False)  # The numeric answer (1-5)
-    answered_at = Column(DateTime, default=datetime.utcnow)
+    answered_at = Column(DateTime, default=datetime.utcnow, server_default=utc_now())
 
     # Relationships
     response = relationship("AssessmentResponse", back_populates="answers")
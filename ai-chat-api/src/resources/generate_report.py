@@ -1,6 +1,12 @@
+import hashlib
 import json
 import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
+matplotlib.use("Agg")  # headless backend; must be set before pyplot is imported
 from jinja2 import Template
+import drawing_utils
 from drawing_utils import (
     draw_radar_chart, 
     draw_perspective_bar_chart, 
@@ -8,6 +14,69 @@ from drawing_utils import (
     draw_growth_bar_chart
 )
 
+# (draw function, output file) for each chart in the report
+CHARTS = [
+    (draw_radar_chart, 'extracted_images/radar_chart.png'),
+    (draw_perspective_bar_chart, 'extracted_images/perspective_bar_chart.png'),
+    (draw_relational_rating_scale, 'extracted_images/relational_rating_scale.png'),
+    (draw_growth_bar_chart, 'extracted_images/growth_bar_chart.png'),
+]
+
+# Rendered charts keyed on a hash of the report data and the drawing code, so
+# identical data (e.g. a user re-running the same assessment) skips matplotlib
+# entirely, while edits to drawing_utils.py invalidate the cache
+CHART_CACHE_DIR = 'charts_cache'
+CHART_CACHE_MAX_FILES = 200
+
+with open(drawing_utils.__file__, 'rb') as f:
+    _DRAWING_CODE_DIGEST = hashlib.blake2b(f.read(), digest_size=16).digest()
+
+def _render_one(args):
+    """Render one chart in a worker process (top-level so it can be pickled)"""
+    draw, data, output_path = args
+    draw(data, output_path)
+    return output_path
+
+def _chart_cache_key(data):
+    """Stable digest of the report data and drawing code used to name cached chart files"""
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.blake2b(_DRAWING_CODE_DIGEST + payload, digest_size=16).hexdigest()
+
+def _sweep_chart_cache():
+    """Drop the least recently used cached charts beyond CHART_CACHE_MAX_FILES"""
+    entries = [e for e in os.scandir(CHART_CACHE_DIR) if e.is_file()]
+    if len(entries) <= CHART_CACHE_MAX_FILES:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime)
+    for entry in entries[:len(entries) - CHART_CACHE_MAX_FILES]:
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+def render_charts(data):
+    """Render all charts in parallel, reusing cached output for identical data"""
+    os.makedirs(CHART_CACHE_DIR, exist_ok=True)
+    key = _chart_cache_key(data)
+
+    jobs = []
+    for draw, path in CHARTS:
+        cached = os.path.join(CHART_CACHE_DIR, f"{key}_{os.path.basename(path)}")
+        if os.path.exists(cached):
+            os.utime(cached)  # mark as recently used for the sweep
+            shutil.copyfile(cached, path)
+        else:
+            jobs.append((draw, data, path, cached))
+
+    if jobs:
+        # Processes rather than threads: matplotlib holds the GIL while rendering
+        # and keeps global figure state
+        with ProcessPoolExecutor(max_workers=len(jobs)) as executor:
+            list(executor.map(_render_one, [(draw, data, path) for draw, data, path, _ in jobs]))
+        for _, _, path, cached in jobs:
+            shutil.copyfile(path, cached)
+        _sweep_chart_cache()
+
 def main():
     # Load data
     with open('report_data.json', 'r', encoding='utf-8') as f:
@@ -17,10 +86,7 @@ def main():
     os.makedirs('extracted_images', exist_ok=True)
     
     # Generate charts using modular utilities
-    draw_radar_chart(data, 'extracted_images/radar_chart.png')
-    draw_perspective_bar_chart(data, 'extracted_images/perspective_bar_chart.png')
-    draw_relational_rating_scale(data, 'extracted_images/relational_rating_scale.png')
-    draw_growth_bar_chart(data, 'extracted_images/growth_bar_chart.png')
+    render_charts(data)
     
     # Load template
     with open('report_template.md', 'r', encoding='utf-8') as f:
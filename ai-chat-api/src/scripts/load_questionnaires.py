@@ -2,9 +2,11 @@
 Script to load questionnaire data from JSON files into the database
 Run this script once to populate the questionnaire tables
 """
-import json
+import orjson
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 # Add parent directory to path
@@ -18,150 +20,146 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def load_questionnaire_from_json(json_file: Path, db: Session):
-    """Load a single questionnaire from JSON file into database"""
+# Default 5-point Likert scale options with scores
+DEFAULT_OPTIONS = [
+    {"value": 1, "label": "非常不符合", "score": 1},
+    {"value": 2, "label": "不太符合", "score": 2},
+    {"value": 3, "label": "一般", "score": 3},
+    {"value": 4, "label": "比较符合", "score": 4},
+    {"value": 5, "label": "非常符合", "score": 5}
+]
+
+
+def _question_row(questionnaire_id: str, q: dict, category=None, sub_section=None, dimension=None) -> dict:
+    """
+    Build an assessment_questions row. Every row carries the same keys so the
+    rows of all files can go into a single executemany INSERT.
+    """
+    return {
+        "questionnaire_id": questionnaire_id,
+        "question_number": q["id"],
+        "text": q["text"],
+        "category": category,
+        "sub_section": sub_section,
+        "dimension": dimension,
+        # Use provided options or default Likert scale
+        "options": q.get("options") or DEFAULT_OPTIONS
+    }
+
+
+def parse_questionnaire_json(json_file: Path):
+    """Parse a questionnaire JSON file into its questionnaire row and question rows"""
+    with open(json_file, 'rb') as f:
+        data = orjson.loads(f.read())
+
+    questionnaire_id = json_file.stem  # e.g., "questionnaire_2_1"
+
+    questionnaire = {
+        "id": questionnaire_id,
+        "section": data.get("section"),
+        "title": data.get("title"),
+        "marking_criteria": data.get("marking_criteria")
+    }
+
+    questions = []
+
+    # Handle different JSON structures
+    if "questions" in data:
+        # Flat structure (questionnaire_2_1)
+        for q in data["questions"]:
+            questions.append(_question_row(questionnaire_id, q))
+
+    elif "dimensions" in data:
+        # Dimensions structure (questionnaire_2_5)
+        for dimension in data["dimensions"]:
+            dimension_name = dimension.get("name")
+            if "questions" in dimension:
+                for q in dimension["questions"]:
+                    questions.append(_question_row(questionnaire_id, q, dimension=dimension_name))
+
+    elif "sub_sections" in data:
+        # Sub-sections structure (questionnaire_2_2, questionnaire_2_3)
+        for sub_section in data["sub_sections"]:
+            sub_section_id = sub_section.get("id")
+
+            # Handle categories within sub_sections
+            if "categories" in sub_section:
+                for category in sub_section["categories"]:
+                    category_name = category.get("name")
+                    if "questions" in category:
+                        for q in category["questions"]:
+                            questions.append(_question_row(
+                                questionnaire_id, q, category=category_name, sub_section=sub_section_id
+                            ))
+
+            # Handle direct questions in sub_section
+            elif "questions" in sub_section:
+                for q in sub_section["questions"]:
+                    questions.append(_question_row(questionnaire_id, q, sub_section=sub_section_id))
+
+            # Handle options with questions
+            elif "options" in sub_section:
+                for option in sub_section["options"]:
+                    if "questions" in option:
+                        for q in option["questions"]:
+                            questions.append(_question_row(
+                                questionnaire_id, q,
+                                category=q.get("type"),  # For automatic thought patterns
+                                sub_section=sub_section_id
+                            ))
+
+    return questionnaire, questions
+
+
+def load_questionnaires(json_files, db: Session):
+    """
+    Load every questionnaire not yet in the database. Rows from all files are
+    inserted with one multi-row INSERT per table and committed together.
+    """
+    questionnaires = []
+    questions = []
+    loaded = []
+
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        questionnaire_id = json_file.stem  # e.g., "questionnaire_2_1"
-
-        # Check if questionnaire already exists
-        existing = db.query(AssessmentQuestionnaire).filter(AssessmentQuestionnaire.id == questionnaire_id).first()
-        if existing:
-            logger.info(f"Questionnaire {questionnaire_id} already exists, skipping...")
-            return
-
-        # Create questionnaire
-        questionnaire = AssessmentQuestionnaire(
-            id=questionnaire_id,
-            section=data.get("section"),
-            title=data.get("title"),
-            marking_criteria=data.get("marking_criteria")
-        )
-        db.add(questionnaire)
-        db.flush()  # Get the ID without committing
-
-        # Generate standard 5-point Likert scale options if not provided
-        marking_criteria = data.get("marking_criteria", {})
-        scale_description = marking_criteria.get("scale", "")
-
-        # Default 5-point Likert scale options with scores
-        default_options = [
-            {"value": 1, "label": "非常不符合", "score": 1},
-            {"value": 2, "label": "不太符合", "score": 2},
-            {"value": 3, "label": "一般", "score": 3},
-            {"value": 4, "label": "比较符合", "score": 4},
-            {"value": 5, "label": "非常符合", "score": 5}
-        ]
-
-        # Extract and save questions
-        questions_added = 0
-
-        # Handle different JSON structures
-        if "questions" in data:
-            # Flat structure (questionnaire_2_1)
-            for q in data["questions"]:
-                # Use provided options or default Likert scale
-                options = q.get("options") if q.get("options") else default_options
-
-                question = AssessmentQuestion(
-                    questionnaire_id=questionnaire_id,
-                    question_number=q["id"],
-                    text=q["text"],
-                    options=options
-                )
-                db.add(question)
-                questions_added += 1
-
-        elif "dimensions" in data:
-            # Dimensions structure (questionnaire_2_5)
-            for dimension in data["dimensions"]:
-                dimension_name = dimension.get("name")
-                if "questions" in dimension:
-                    for q in dimension["questions"]:
-                        # Use provided options or default Likert scale
-                        options = q.get("options") if q.get("options") else default_options
-
-                        question = AssessmentQuestion(
-                            questionnaire_id=questionnaire_id,
-                            question_number=q["id"],
-                            text=q["text"],
-                            dimension=dimension_name,
-                            options=options
-                        )
-                        db.add(question)
-                        questions_added += 1
-
-        elif "sub_sections" in data:
-            # Sub-sections structure (questionnaire_2_2, questionnaire_2_3)
-            for sub_section in data["sub_sections"]:
-                sub_section_id = sub_section.get("id")
-
-                # Handle categories within sub_sections
-                if "categories" in sub_section:
-                    for category in sub_section["categories"]:
-                        category_name = category.get("name")
-                        if "questions" in category:
-                            for q in category["questions"]:
-                                # Use provided options or default Likert scale
-                                options = q.get("options") if q.get("options") else default_options
-
-                                question = AssessmentQuestion(
-                                    questionnaire_id=questionnaire_id,
-                                    question_number=q["id"],
-                                    text=q["text"],
-                                    category=category_name,
-                                    sub_section=sub_section_id,
-                                    options=options
-                                )
-                                db.add(question)
-                                questions_added += 1
-
-                # Handle direct questions in sub_section
-                elif "questions" in sub_section:
-                    for q in sub_section["questions"]:
-                        # Use provided options or default Likert scale
-                        options = q.get("options") if q.get("options") else default_options
-
-                        question = AssessmentQuestion(
-                            questionnaire_id=questionnaire_id,
-                            question_number=q["id"],
-                            text=q["text"],
-                            sub_section=sub_section_id,
-                            options=options
-                        )
-                        db.add(question)
-                        questions_added += 1
-
-                # Handle options with questions
-                elif "options" in sub_section:
-                    for option in sub_section["options"]:
-                        if "questions" in option:
-                            for q in option["questions"]:
-                                # Use provided options or default Likert scale
-                                question_options = q.get("options") if q.get("options") else default_options
-
-                                question = AssessmentQuestion(
-                                    questionnaire_id=questionnaire_id,
-                                    question_number=q["id"],
-                                    text=q["text"],
-                                    sub_section=sub_section_id,
-                                    category=q.get("type"),  # For automatic thought patterns
-                                    options=question_options
-                                )
-                                db.add(question)
-                                questions_added += 1
+        # One query for the already-loaded ids instead of one per file
+        existing_ids = {row.id for row in db.query(AssessmentQuestionnaire.id)}
 
+        pending = []
+        for json_file in json_files:
+            questionnaire_id = json_file.stem
+
+            if questionnaire_id in existing_ids:
+                logger.info(f"Questionnaire {questionnaire_id} already exists, skipping...")
+                continue
+            existing_ids.add(questionnaire_id)
+            pending.append(json_file)
+
+        # Read and parse the files concurrently; the session stays on this thread
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(8, len(pending))) as executor:
+                parsed = list(executor.map(parse_questionnaire_json, pending))
+        else:
+            parsed = []
+
+        for questionnaire, file_questions in parsed:
+            questionnaires.append(questionnaire)
+            questions.extend(file_questions)
+            loaded.append((questionnaire["id"], len(file_questions)))
+
+        if questionnaires:
+            db.execute(insert(AssessmentQuestionnaire.__table__), questionnaires)
+        if questions:
+            db.execute(insert(AssessmentQuestion.__table__), questions)
         db.commit()
-        logger.info(f"✓ Loaded {questionnaire_id}: {questions_added} questions")
-        return questionnaire
 
     except Exception as e:
-        logger.error(f"✗ Error loading {json_file}: {e}")
+        logger.error(f"✗ Error loading questionnaires: {e}")
         db.rollback()
         raise
 
+    for questionnaire_id, question_count in loaded:
+        logger.info(f"✓ Loaded {questionnaire_id}: {question_count} questions")
+
 
 def main():
     """Load all questionnaires from JSON files"""
@@ -177,14 +175,12 @@ def main():
         logger.error(f"Questionnaires directory not found: {questionnaires_dir}")
         return
 
-    # Load each questionnaire
     db = SessionLocal()
     try:
         json_files = sorted(questionnaires_dir.glob("questionnaire_*.json"))
         logger.info(f"Found {len(json_files)} questionnaire files")
 
-        for json_file in json_files:
-            load_questionnaire_from_json(json_file, db)
+        load_questionnaires(json_files, db)
 
         logger.info("✓ All questionnaires loaded successfully!")
 
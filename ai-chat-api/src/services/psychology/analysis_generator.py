@@ -6,10 +6,11 @@ psychological patterns and elements.
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 from sqlalchemy.orm import Session
-import openai
-from src.config.settings import OPENAI_API_KEY, PSYCHOLOGY_LLM_MODEL
+from openai import OpenAI
+from src.config.settings import OPENAI_API_KEY, PSYCHOLOGY_LLM_MODEL, AI_MAX_RETRIES
 from src.database.psychology_models import (
     AnalysisText,
     IFSPartsDetection,
@@ -19,8 +20,9 @@ from src.database.psychology_models import (
 
 logger = logging.getLogger(__name__)
 
-# Configure OpenAI
-openai.api_key = OPENAI_API_KEY
+# Shared OpenAI client (thread-safe, pooled connections); the module-level
+# openai.ChatCompletion API was removed in openai>=1.0
+client = OpenAI(api_key=OPENAI_API_KEY, max_retries=AI_MAX_RETRIES)
 
 
 # AI Prompt Templates
@@ -151,7 +153,7 @@ def generate_ifs_impact_analysis(
         )
 
         # Call OpenAI API
-        response = openai.ChatCompletion.create(
+        response = client.chat.completions.create(
             model=PSYCHOLOGY_LLM_MODEL,
             messages=[
                 {"role": "system", "content": "你是一位专业、温和、富有同理心的心理咨询师。"},
@@ -220,7 +222,7 @@ def generate_cognitive_pattern_impact(
         )
 
         # Call OpenAI API
-        response = openai.ChatCompletion.create(
+        response = client.chat.completions.create(
             model=PSYCHOLOGY_LLM_MODEL,
             messages=[
                 {"role": "system", "content": "你是一位专业、温和、富有同理心的认知行为治疗师。"},
@@ -285,7 +287,7 @@ def generate_narrative_summary(
         )
 
         # Call OpenAI API
-        response = openai.ChatCompletion.create(
+        response = client.chat.completions.create(
             model=PSYCHOLOGY_LLM_MODEL,
             messages=[
                 {"role": "system", "content": "你是一位专业、温和、富有同理心的叙事治疗师。"},
@@ -346,7 +348,7 @@ def generate_conflict_trigger_analysis(
         )
 
         # Call OpenAI API
-        response = openai.ChatCompletion.create(
+        response = client.chat.completions.create(
             model=PSYCHOLOGY_LLM_MODEL,
             messages=[
                 {"role": "system", "content": "你是一位专业、温和、富有同理心的依恋理论专家。"},
@@ -407,20 +409,67 @@ def generate_all_analysis_texts(
     }
 
     try:
-        # 1. Generate IFS impact analysis
         ifs_part = dominant_elements.get('ifs_part')
-        if ifs_part:
-            ifs_impact_text = generate_ifs_impact_analysis(
+        cognitive_pattern = dominant_elements.get('cognitive_pattern')
+        narrative = dominant_elements.get('narrative')
+
+        # Conflict triggers come from the attachment data
+        attachment_style = db_session.query(AttachmentStyle).filter(
+            AttachmentStyle.assessment_id == assessment_id
+        ).first()
+
+        # The four texts are independent LLM calls, so request them concurrently;
+        # they are saved below on this thread, which owns the session
+        with ThreadPoolExecutor(max_workers=4, thread_name_prefix="analysis-text") as executor:
+            # 1. IFS impact analysis
+            ifs_future = executor.submit(
+                generate_ifs_impact_analysis,
                 part_id=ifs_part['part_id'],
                 part_name_zh=ifs_part['part_name_zh'],
                 confidence=ifs_part['confidence'],
                 category_score=ifs_part.get('category_score', 0),
                 evidence_text=ifs_part.get('evidence_text'),
                 language=language
-            )
-            result['ifs_impact'] = ifs_impact_text
+            ) if ifs_part else None
+
+            # 2. Cognitive pattern impact
+            cognitive_future = executor.submit(
+                generate_cognitive_pattern_impact,
+                pattern_id=cognitive_pattern['pattern_id'],
+                pattern_name_zh=cognitive_pattern['pattern_name_zh'],
+                confidence=cognitive_pattern['confidence'],
+                detection_count=cognitive_pattern['detection_count'],
+                evidence_examples=cognitive_pattern.get('evidence_examples'),
+                language=language
+            ) if cognitive_pattern else None
 
-            # Store in database
+            # 3. Narrative summary
+            narrative_future = executor.submit(
+                generate_narrative_summary,
+                narrative_id=narrative['narrative_id'],
+                narrative_name_zh=narrative['narrative_name_zh'],
+                score=narrative['score'],
+                confidence=narrative['confidence'],
+                evidence_data=narrative.get('evidence_data'),
+                language=language
+            ) if narrative else None
+
+            # 4. Conflict trigger analysis
+            conflict_future = executor.submit(
+                generate_conflict_trigger_analysis,
+                attachment_scores={
+                    'secure': attachment_style.secure_score or 0,
+                    'anxious': attachment_style.anxious_score or 0,
+                    'avoidant': attachment_style.avoidant_score or 0,
+                    'disorganized': attachment_style.disorganized_score or 0
+                },
+                dominant_style=attachment_style.dominant_style or '未知',
+                language=language
+            ) if attachment_style else None
+
+        # Store in database
+        if ifs_future:
+            result['ifs_impact'] = ifs_future.result()
             _save_analysis_text(
                 user_id=user_id,
                 assessment_id=assessment_id,
@@ -428,24 +477,12 @@ def generate_all_analysis_texts(
                 analysis_category='inner_system',
                 related_entity_type='ifs_part',
                 related_entity_id=ifs_part['part_id'],
-                text_zh=ifs_impact_text,
+                text_zh=result['ifs_impact'],
                 db_session=db_session
             )
 
-        # 2. Generate cognitive pattern impact
-        cognitive_pattern = dominant_elements.get('cognitive_pattern')
-        if cognitive_pattern:
-            cognitive_impact_text = generate_cognitive_pattern_impact(
-                pattern_id=cognitive_pattern['pattern_id'],
-                pattern_name_zh=cognitive_pattern['pattern_name_zh'],
-                confidence=cognitive_pattern['confidence'],
-                detection_count=cognitive_pattern['detection_count'],
-                evidence_examples=cognitive_pattern.get('evidence_examples'),
-                language=language
-            )
-            result['cognitive_impact'] = cognitive_impact_text
-
-            # Store in database
+        if cognitive_future:
+            result['cognitive_impact'] = cognitive_future.result()
             _save_analysis_text(
                 user_id=user_id,
                 assessment_id=assessment_id,
@@ -453,24 +490,12 @@ def generate_all_analysis_texts(
                 analysis_category='automatic_thought',
                 related_entity_type='cognitive_pattern',
                 related_entity_id=cognitive_pattern['pattern_id'],
-                text_zh=cognitive_impact_text,
+                text_zh=result['cognitive_impact'],
                 db_session=db_session
             )
 
-        # 3. Generate narrative summary
-        narrative = dominant_elements.get('narrative')
-        if narrative:
-            narrative_summary_text = generate_narrative_summary(
-                narrative_id=narrative['narrative_id'],
-                narrative_name_zh=narrative['narrative_name_zh'],
-                score=narrative['score'],
-                confidence=narrative['confidence'],
-                evidence_data=narrative.get('evidence_data'),
-                language=language
-            )
-            result['narrative_summary'] = narrative_summary_text
-
-            # Store in database
+        if narrative_future:
+            result['narrative_summary'] = narrative_future.result()
             _save_analysis_text(
                 user_id=user_id,
                 assessment_id=assessment_id,
@@ -478,32 +503,12 @@ def generate_all_analysis_texts(
                 analysis_category='narrative_structure',
                 related_entity_type='narrative',
                 related_entity_id=narrative['narrative_id'],
-                text_zh=narrative_summary_text,
+                text_zh=result['narrative_summary'],
                 db_session=db_session
             )
 
-        # 4. Generate conflict trigger analysis (from attachment data)
-        # Query attachment style from database
-        attachment_style = db_session.query(AttachmentStyle).filter(
-            AttachmentStyle.assessment_id == assessment_id
-        ).first()
-
-        if attachment_style:
-            attachment_scores = {
-                'secure': attachment_style.secure_score or 0,
-                'anxious': attachment_style.anxious_score or 0,
-                'avoidant': attachment_style.avoidant_score or 0,
-                'disorganized': attachment_style.disorganized_score or 0
-            }
-
-            conflict_trigger_text = generate_conflict_trigger_analysis(
-                attachment_scores=attachment_scores,
-                dominant_style=attachment_style.dominant_style or '未知',
-                language=language
-            )
-            result['conflict_triggers'] = conflict_trigger_text
-
-            # Store in database
+        if conflict_future:
+            result['conflict_triggers'] = conflict_future.result()
             _save_analysis_text(
                 user_id=user_id,
                 assessment_id=assessment_id,
@@ -511,7 +516,7 @@ def generate_all_analysis_texts(
                 analysis_category='relational_insight',
                 related_entity_type='attachment_style',
                 related_entity_id=str(attachment_style.id),
-                text_zh=conflict_trigger_text,
+                text_zh=result['conflict_triggers'],
                 db_session=db_session
             )
 
@@ -56,19 +56,17 @@ def identify_dominant_ifs_part(
         }
     """
     try:
-        # Query IFS parts ordered by confidence (highest first)
-        parts = db_session.query(IFSPartsDetection).filter(
+        # Let the database pick the highest confidence part (ORDER BY ... LIMIT 1)
+        # instead of loading and sorting every detected part
+        dominant = db_session.query(IFSPartsDetection).filter(
             IFSPartsDetection.assessment_id == assessment_id,
             IFSPartsDetection.detected == True
-        ).order_by(IFSPartsDetection.confidence_score.desc()).all()
+        ).order_by(IFSPartsDetection.confidence_score.desc()).first()
 
-        if not parts:
+        if not dominant:
             logger.info(f"No IFS parts detected for assessment {assessment_id}")
             return None
 
-        # Get the highest confidence part
-        dominant = parts[0]
-
         result = {
             'part_id': dominant.part_id,
             'part_name_zh': dominant.part_name_zh,
@@ -107,19 +105,16 @@ def identify_dominant_cognitive_pattern(
         }
     """
     try:
-        # Query cognitive patterns ordered by detection count (highest first)
-        patterns = db_session.query(CognitivePatternsDetection).filter(
+        # Let the database pick the highest count pattern (ORDER BY ... LIMIT 1)
+        dominant = db_session.query(CognitivePatternsDetection).filter(
             CognitivePatternsDetection.assessment_id == assessment_id,
             CognitivePatternsDetection.detected == True
-        ).order_by(CognitivePatternsDetection.detection_count.desc()).all()
+        ).order_by(CognitivePatternsDetection.detection_count.desc()).first()
 
-        if not patterns:
+        if not dominant:
             logger.info(f"No cognitive patterns detected for assessment {assessment_id}")
             return None
 
-        # Get the highest count pattern
-        dominant = patterns[0]
-
         result = {
             'pattern_id': dominant.pattern_id,
             'pattern_name_zh': dominant.pattern_name_zh,
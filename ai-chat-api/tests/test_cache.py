@@ -0,0 +1,51 @@
+"""
+Test In-Process Caches
+
+Tests for the TTL/LRU cache used by the chat service
+"""
+
+import time
+from src.services.cache import TTLCache
+
+
+def test_get_and_set():
+    """Test basic storage and default on miss"""
+    cache = TTLCache(maxsize=4, ttl=60)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("missing") is None
+    assert cache.get("missing", "fallback") == "fallback"
+
+
+def test_lru_eviction():
+    """Test least recently used entry is evicted first"""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # a is now most recently used
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_expiry():
+    """Test entries expire after ttl"""
+    cache = TTLCache(maxsize=4, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_no_expiry_without_ttl():
+    """Test entries never expire when ttl is None"""
+    cache = TTLCache(maxsize=2, ttl=None)
+    cache.set("a", 1)
+    time.sleep(0.01)
+
+    assert cache.get("a") == 1
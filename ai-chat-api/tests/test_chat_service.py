@@ -0,0 +1,99 @@
+"""
+Test Chat Service Helpers
+
+Tests for prompt trimming and recommendation extraction in the chat service
+"""
+
+import pytest
+from src.api import chat_service
+
+
+def _message(role, content):
+    return {"role": role, "content": content}
+
+
+@pytest.fixture
+def conversation():
+    """[system] + five history turns + [module status]; history turns are ~104 tokens each"""
+    return [
+        _message("system", "S" * 40),
+        _message("user", "1" * 400),
+        _message("assistant", "2" * 400),
+        _message("user", "3" * 400),
+        _message("assistant", "4" * 400),
+        _message("user", "5" * 400),
+        _message("system", "T" * 40),
+    ]
+
+
+def _set_budget(monkeypatch, budget):
+    """Make the prompt token budget exactly `budget`"""
+    monkeypatch.setattr(
+        chat_service, "AI_CONTEXT_WINDOW",
+        budget + chat_service.AI_MAX_TOKENS + chat_service._CONTEXT_SAFETY_MARGIN
+    )
+
+
+def _tokens(messages):
+    return sum(chat_service._estimate_tokens(m["content"]) for m in messages)
+
+
+def test_trim_keeps_prompt_that_fits(monkeypatch, conversation):
+    """Test nothing is dropped when the prompt is within budget"""
+    _set_budget(monkeypatch, _tokens(conversation))
+    original = list(conversation)
+
+    assert chat_service._trim_to_context_window(conversation) == 0
+    assert conversation == original
+
+
+def test_trim_drops_oldest_turns_first(monkeypatch, conversation):
+    """Test the oldest history is dropped until the prompt fits"""
+    system, status = conversation[0], conversation[-1]
+    kept = conversation[4:6]
+    _set_budget(monkeypatch, _tokens([system, *kept, status]))
+
+    dropped = chat_service._trim_to_context_window(conversation)
+
+    assert dropped == 3
+    assert conversation == [system, *kept, status]
+
+
+def test_trim_always_keeps_system_latest_turn_and_status(monkeypatch, conversation):
+    """Test the system prompt, latest user turn and status survive any budget"""
+    system, latest, status = conversation[0], conversation[-2], conversation[-1]
+    _set_budget(monkeypatch, 1)
+
+    dropped = chat_service._trim_to_context_window(conversation)
+
+    assert dropped == 4
+    assert conversation == [system, latest, status]
+
+
+def test_extract_recommendations_skips_malformed_arguments():
+    """Test malformed recommend_module arguments are ignored without dropping valid calls"""
+    tool_calls = [
+        ("recommend_module", '{"module_id": "breathing_exercise"'),  # truncated JSON
+        ("recommend_module", '{"reasoning": "no module id"}'),
+        ("recommend_module", '{"module_id": "emotion_labeling", "reasoning": "r"}'),
+    ]
+
+    recommended, function_calls = chat_service._extract_recommendations(
+        "OK", tool_calls, {}, "english"
+    )
+
+    assert [m["module_id"] for m in recommended] == ["emotion_labeling"]
+    assert function_calls == [{
+        "function": "recommend_module",
+        "arguments": {"module_id": "emotion_labeling", "reasoning": "r"}
+    }]
+
+
+def test_extract_recommendations_defaults_missing_reasoning():
+    """Test reasoning is optional in recommend_module arguments"""
+    recommended, function_calls = chat_service._extract_recommendations(
+        "OK", [("recommend_module", '{"module_id": "breathing_exercise"}')], {}, "english"
+    )
+
+    assert [m["module_id"] for m in recommended] == ["breathing_exercise"]
+    assert function_calls[0]["arguments"] == {"module_id": "breathing_exercise", "reasoning": ""}
@@ -0,0 +1,66 @@
+"""
+Test Questionnaire Submission
+
+Tests that submitted answers are saved against the right questions
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from src.api.app import app
+from src.database.database import get_db
+from src.database.models import Base, Conversation
+from src.database.questionnaire_models import (
+    AssessmentQuestionnaire,
+    AssessmentQuestion,
+    AssessmentAnswer
+)
+
+
+@pytest.fixture
+def db_session():
+    """Create an in-memory database shared by the test and the app"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    app.dependency_overrides[get_db] = lambda: session
+
+    yield session
+
+    app.dependency_overrides.pop(get_db, None)
+    session.close()
+    Base.metadata.drop_all(engine)
+
+
+def test_submit_saves_answers_by_question_number(db_session):
+    """Test each answer maps to the first question with its number and unknown numbers are skipped"""
+    conversation = Conversation(session_id="submit-test")
+    db_session.add(conversation)
+    db_session.add(AssessmentQuestionnaire(id="questionnaire_test", section="test", title="Test"))
+    # Question numbers restart in each sub-section
+    questions = [
+        AssessmentQuestion(questionnaire_id="questionnaire_test", question_number=1, text="a1", sub_section="a"),
+        AssessmentQuestion(questionnaire_id="questionnaire_test", question_number=2, text="a2", sub_section="a"),
+        AssessmentQuestion(questionnaire_id="questionnaire_test", question_number=1, text="b1", sub_section="b"),
+    ]
+    db_session.add_all(questions)
+    db_session.commit()
+
+    response = TestClient(app).post(
+        f"/conversations/{conversation.id}/questionnaires/submit",
+        json={"questionnaire_id": "questionnaire_test", "answers": {"1": 3, "2": 5, "99": 1}}
+    )
+
+    assert response.status_code == 200
+    answers = db_session.query(AssessmentAnswer).order_by(AssessmentAnswer.id).all()
+    assert [(a.question_id, a.answer_value) for a in answers] == [
+        (questions[0].id, 3),
+        (questions[1].id, 5),
+    ]
+    assert all(a.response_id == response.json()["response_id"] for a in answers)
@@ -0,0 +1,74 @@
+"""
+Test Settings
+
+Tests for the .env file loader
+"""
+
+import os
+from unittest import mock
+
+import pytest
+from src.config.settings import _load_env
+
+
+@pytest.fixture
+def load(tmp_path):
+    """Write a .env file, load it into a scratch copy of os.environ and return that copy"""
+    def _load(content, **existing):
+        path = tmp_path / ".env"
+        path.write_text(content, encoding="utf-8")
+        with mock.patch.dict(os.environ, existing):
+            _load_env(path)
+            return dict(os.environ)
+    return _load
+
+
+def test_plain_values_and_comments(load):
+    """Test KEY=VALUE lines, blank lines and comment lines"""
+    env = load("# comment\n\nTEST_ENV_A=1\n  TEST_ENV_B = two words  \n")
+
+    assert env["TEST_ENV_A"] == "1"
+    assert env["TEST_ENV_B"] == "two words"
+
+
+def test_export_prefix(load):
+    """Test an `export ` prefix is ignored"""
+    env = load("export TEST_ENV_A=value\n")
+
+    assert env["TEST_ENV_A"] == "value"
+
+
+def test_inline_comment_on_unquoted_value(load):
+    """Test ` #` starts a trailing comment, but `#` without a space does not"""
+    env = load("TEST_ENV_A=value # comment\nTEST_ENV_B=a#b\n")
+
+    assert env["TEST_ENV_A"] == "value"
+    assert env["TEST_ENV_B"] == "a#b"
+
+
+def test_quoted_values(load):
+    """Test quotes are stripped and `=`/`#` inside them are kept"""
+    env = load(
+        'TEST_ENV_A="double quoted"\n'
+        "TEST_ENV_B='single quoted'\n"
+        'TEST_ENV_C="a=b # not a comment" # comment\n'
+        "TEST_ENV_D=postgresql://u:p@h/db?sslmode=require\n"
+    )
+
+    assert env["TEST_ENV_A"] == "double quoted"
+    assert env["TEST_ENV_B"] == "single quoted"
+    assert env["TEST_ENV_C"] == "a=b # not a comment"
+    assert env["TEST_ENV_D"] == "postgresql://u:p@h/db?sslmode=require"
+
+
+def test_existing_environment_wins(load):
+    """Test variables already in the environment are not overridden"""
+    env = load("TEST_ENV_A=from-file\nTEST_ENV_B=from-file\n", TEST_ENV_A="from-env")
+
+    assert env["TEST_ENV_A"] == "from-env"
+    assert env["TEST_ENV_B"] == "from-file"
+
+
+def test_missing_file_is_ignored(tmp_path):
+    """Test a missing .env file is not an error"""
+    _load_env(tmp_path / "missing.env")